@@ -5,21 +5,40 @@ Boss直聘爬虫工具
 
 # ==================== 导入必要的库 ====================
 import re          # 正则表达式，用于匹配文本模式
-import json        # JSON数据处理，用于保存和读取数据
+import orjson      # JSON数据处理（C语言实现，比标准库json快），用于保存和读取数据
 import csv         # CSV文件处理，用于保存Excel可读的格式
+import sqlite3     # SQLite数据库，用于保存cookies
 import random      # 随机数生成，用于模拟人类操作（随机延迟）
+import asyncio     # 异步编程，用于接口请求之间的等待
+import functools   # 函数缓存，用于避免重复解析配置文件
 from pathlib import Path  # 路径处理，用于操作文件路径
-from typing import Callable, Optional, Union, Set, List  # 类型提示，帮助理解函数参数类型
+from contextlib import closing  # 用完后自动关闭数据库连接
+from dataclasses import dataclass, asdict  # 数据类，用于定义职位信息的结构
+from typing import AbstractSet, Callable, Optional, Union, Set, List, Iterable, Iterator, TextIO  # 类型提示，帮助理解函数参数类型
 from urllib.parse import urlencode, quote  # URL编码，用于构建搜索链接
-from typing import AsyncGenerator  # 异步生成器类型
-from playwright.async_api import BrowserContext, Page, Locator, async_playwright, expect  # 浏览器自动化工具
-from pydantic import BaseModel  # 数据验证，确保数据格式正确
+from typing import AsyncGenerator, AsyncIterator  # 异步生成器类型
+from playwright.async_api import Browser, BrowserContext, Page, Locator, Playwright, Route, async_playwright, expect  # 浏览器自动化工具
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError  # 等待元素超时的异常
+from curl_cffi.requests import AsyncSession  # 模拟Chrome TLS指纹的HTTP客户端，用于直接调用接口
 
 
 # ==================== 全局常量 ====================
 # Boss直聘网站的基础URL
 base_url = "https://www.zhipin.com"
 
+# 职位列表接口和职位详情接口（网页前端也是通过这两个接口获取数据的）
+joblist_api = "/wapi/zpgeek/search/joblist.json"
+job_detail_api = "/wapi/zpgeek/job/detail.json"
+
+# 登录后不再加载的资源类型（样式表保留，浏览器模式下判断元素是否可见需要页面布局）
+blocked_resource_types = {"image", "font", "media"}
+
+# 同时获取职位详情的工作协程数量
+detail_workers = 8
+
+# 从配置文件搜索时，同时进行的搜索任务数量（接口要求验证时每个任务都会打开一个浏览器页面）
+config_task_workers = 4
+
 # 城市代码到城市名称的映射表
 city_code_mapping = {
     "100010000": "全国",
@@ -45,6 +64,32 @@ city_code_mapping = {
     "101220100": "合肥"
 }
 
+# 浏览器模式下一次性读取页面信息的脚本（每个职位只需两次通信，而不是逐个元素读取）
+# 职位卡片：公司名称、职位链接、地区、标签
+card_fields_js = """el => ({
+    company: el.querySelector('.boss-name')?.innerText ?? '',
+    href: el.querySelector('.job-name')?.getAttribute('href') ?? '',
+    area: el.querySelector('.job-area, .job-limit')?.innerText ?? '',
+    tag: el.querySelector('.job-tag-icon')?.getAttribute('alt') ?? null,
+})"""
+# 职位详情框：职位名称、薪资、描述、HR活跃时间、工作地点、基本信息
+detail_fields_js = """el => ({
+    title: el.querySelector('.job-name')?.innerText ?? '',
+    salary: el.querySelector('.job-salary')?.innerText ?? '',
+    desc: el.querySelector('.desc')?.innerText ?? '',
+    active: el.querySelector('.job-boss-info .boss-active-time')?.innerText ?? '',
+    location: el.querySelector('.job-location, .job-area, .location')?.innerText ?? '',
+    info: el.querySelector('.info-primary, .job-primary, .job-header, .job-detail-header')?.innerText ?? '',
+})"""
+
+# 预编译的正则表达式（只编译一次，每个职位直接使用）
+# 工作年限：所有常见写法合并成一个表达式，一次匹配即可
+experience_pattern = re.compile(r'(\d+[-~]\d+年(?:工作)?经验|\d+年以上(?:工作)?经验|应届(?:毕业生)?|实习|\d+[-~]\d+年|\d+年以上|不限)')
+# 城市：所有城市名称合并成一个表达式，一次扫描找到文本中的城市
+city_pattern = re.compile("|".join(re.escape(c) for c in city_code_mapping.values() if c != "全国"))
+# HR活跃时间：包含周/月/年说明HR可能不活跃
+inactive_pattern = re.compile(r"[周月年]")
+
 # 筛选项代码到可见文本的映射（用于在页面上点击筛选）
 salary_code_to_text = {
     "101": "5K-10K",
@@ -89,13 +134,94 @@ salary_mapping = {
     chr(0xE039): "8",  # 特殊字符 → 数字8
     chr(0xE03a): "9",  # 特殊字符 → 数字9
 }
+# 由映射表生成的字符转换表（str.translate 一次完成所有字符替换）
+salary_table = str.maketrans(salary_mapping)
+
+# SQLite数据库文件开头的16个字节（用来区分旧版本保存的JSON格式cookies文件）
+sqlite_header = b"SQLite format 3\x00"
 
 
 # ==================== Cookie管理函数 ====================
 
+def open_cookie_db(cookies_path: Path) -> sqlite3.Connection:
+    """
+    打开cookies数据库（不存在时自动创建表）
+    
+    为什么用SQLite而不是JSON文件？
+    - 更新cookies在一个事务中完成，不用重写整个文件
+    - WAL模式下写入中途出错也不会损坏已有数据
+    
+    参数：
+        cookies_path: cookies数据库文件路径
+    
+    返回：
+        数据库连接
+    """
+    db = sqlite3.connect(cookies_path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS cookies ("
+        "name TEXT, domain TEXT, path TEXT, value TEXT, expires REAL, "
+        "http_only INT, secure INT, same_site TEXT, "
+        "PRIMARY KEY(name, domain, path))"
+    )
+    return db
+
+
+def save_cookie_rows(cookies_path: Path, cookies: List[dict]) -> None:
+    """
+    用给定的cookies替换数据库中的全部cookies
+    
+    先删除旧的行再写入（在同一个事务中），浏览器已经删除或过期的cookie不会残留在数据库中
+    
+    参数：
+        cookies_path: cookies数据库文件路径
+        cookies: cookie字典列表（浏览器 context.cookies() 的格式）
+    """
+    rows = [
+        (c["name"], c["domain"], c["path"], c["value"], c.get("expires", -1),
+         int(c.get("httpOnly", False)), int(c.get("secure", False)), c.get("sameSite", "Lax"))
+        for c in cookies
+    ]
+    with closing(open_cookie_db(cookies_path)) as db, db:
+        db.execute("DELETE FROM cookies")
+        db.executemany("INSERT INTO cookies VALUES (?,?,?,?,?,?,?,?)", rows)
+
+
+def migrate_json_cookies(cookies_path: Path) -> None:
+    """
+    把旧版本保存的JSON格式cookies导入SQLite数据库（只需要执行一次，之后不用重新扫码登录）
+    
+    两种情况需要导入：
+    1. cookies_path 本身是旧的JSON文件（例如 BossZhipin("cookies.json")）：导入后改写为数据库
+    2. 数据库还不存在，但旁边有旧的同名JSON文件（默认的 cookies.db 旁边的 cookies.json）：保留JSON文件
+    
+    JSON文件无法解析时视为没有cookies（之后重新登录）
+    
+    参数：
+        cookies_path: cookies数据库文件路径
+    """
+    source = cookies_path if cookies_path.exists() else cookies_path.with_suffix(".json")
+    if not source.exists():
+        return
+    # 已经是SQLite数据库，不需要导入
+    with open(source, "rb") as f:
+        if f.read(len(sqlite_header)) == sqlite_header:
+            return
+    
+    try:
+        cookies = orjson.loads(source.read_bytes())["cookies"]
+    except (ValueError, KeyError, TypeError):
+        cookies = []
+    # 旧文件就在数据库的位置上时，先删除再创建数据库
+    if source == cookies_path:
+        cookies_path.unlink()
+    save_cookie_rows(cookies_path, cookies)
+
+
 async def load_cookies(context: BrowserContext, cookies_path: Path) -> None:
     """
-    从文件中加载cookies到浏览器上下文
+    从数据库中加载cookies到浏览器上下文
     
     什么是cookies？
     - cookies是网站用来记住你登录状态的小文件
@@ -103,30 +229,77 @@ async def load_cookies(context: BrowserContext, cookies_path: Path) -> None:
     
     参数：
         context: 浏览器上下文（可以理解为浏览器的一个会话）
-        cookies_path: cookies文件保存的路径
+        cookies_path: cookies数据库保存的路径
     """
-    # 检查cookies文件是否存在
+    # 旧版本保存的JSON格式cookies，先导入数据库
+    migrate_json_cookies(cookies_path)
+    
+    # 检查cookies数据库是否存在
     if cookies_path.exists():
-        # 打开文件并读取cookies数据
-        with open(cookies_path, "r") as f:
-            data = json.load(f)  # 从JSON文件读取数据
+        try:
+            with closing(open_cookie_db(cookies_path)) as db:
+                rows = db.execute("SELECT name, domain, path, value, expires, http_only, secure, same_site FROM cookies").fetchall()
+        except sqlite3.DatabaseError:
+            # 数据库文件损坏：删除后重新登录（登录成功后会重新创建）
+            print(f"cookies数据库无法读取，需要重新登录: {cookies_path}")
+            for path in (cookies_path, Path(f"{cookies_path}-wal"), Path(f"{cookies_path}-shm")):
+                path.unlink(missing_ok=True)
+            return
         # 将cookies添加到浏览器上下文，这样浏览器就"记住"了登录状态
-        await context.add_cookies(data["cookies"])
+        if rows:
+            await context.add_cookies([
+                dict(name=name, domain=domain, path=path, value=value, expires=expires,
+                     httpOnly=bool(http_only), secure=bool(secure), sameSite=same_site)
+                for name, domain, path, value, expires, http_only, secure, same_site in rows
+            ])
 
 
 async def dump_cookies(context: BrowserContext, cookies_path: Path) -> None:
     """
-    将浏览器中的cookies保存到文件
+    将浏览器中的cookies保存到数据库
     
     参数：
         context: 浏览器上下文
-        cookies_path: cookies文件保存的路径
+        cookies_path: cookies数据库保存的路径
     """
-    # 从浏览器获取当前的cookies
-    cookies = await context.cookies()
-    # 将cookies保存到文件
-    with open(cookies_path, "w") as f:
-        json.dump({"cookies": cookies}, f)  # 将cookies保存为JSON格式
+    # 从浏览器获取当前的cookies，替换数据库中的全部cookies
+    save_cookie_rows(cookies_path, await context.cookies())
+
+
+async def copy_cookies_to_session(context: BrowserContext, session: AsyncSession) -> None:
+    """
+    将浏览器中的登录cookies复制到接口会话
+    
+    为什么需要这个函数？
+    - 登录必须在浏览器里扫码完成
+    - 登录后直接用HTTP请求调用接口，比渲染页面快得多，但接口同样需要登录cookies
+    
+    参数：
+        context: 已登录的浏览器上下文
+        session: 用于调用接口的HTTP会话
+    """
+    for cookie in await context.cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"])
+
+
+# ==================== 请求拦截函数 ====================
+
+async def block_resources(route: Route) -> None:
+    """
+    拦截不需要的资源请求（图片、字体、音视频）
+    
+    为什么需要这个函数？
+    - 爬虫只需要文字数据，公司logo、广告图片等占了页面流量的大部分
+    - 不下载这些资源，页面加载更快，也不用解码和绘制图片
+    - 页面脚本和接口请求（script/xhr/fetch）正常放行，职位数据来自这些请求
+    
+    参数：
+        route: 被拦截的请求
+    """
+    if route.request.resource_type in blocked_resource_types:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 # ==================== 登录函数 ====================
@@ -156,42 +329,64 @@ async def login(context: BrowserContext, page: Page, cookies_path: Path, headles
     await load_cookies(context, cookies_path)
     
     # 步骤2: 访问登录页面
-    # wait_until="networkidle" 表示等待页面完全加载完成
-    await page.goto(f"{base_url}/web/user/?ka=header-login", wait_until="networkidle")
+    # wait_until="domcontentloaded" 表示页面结构加载完成即可，不等待广告、统计等无关请求
+    await page.goto(f"{base_url}/web/user/?ka=header-login", wait_until="domcontentloaded")
     
     # 步骤3: 查找用户头像元素（如果存在说明已经登录）
     figure = page.locator(".nav-figure")  # .nav-figure 是用户头像的CSS选择器
     
-    # 步骤4: 循环检查登录状态（最多检查300次，每次等待1秒）
-    for _ in range(300):
-        # 如果用户头像可见，说明已经登录
-        if await figure.is_visible():
-            # 保存cookies，下次就不需要重新登录了
-            await dump_cookies(context, cookies_path)
-            return True  # 登录成功
-        
-        # 如果还没登录，尝试处理登录流程
-        try:
-            # 如果是无头模式（后台运行），需要处理二维码
-            if headless_cb:
-                wx_btn = page.locator(".wx-login-btn")  # 微信登录按钮
-                if await wx_btn.is_visible():
-                    # 点击微信登录按钮
-                    await wx_btn.click(delay=random.randint(32, 512))  # 随机延迟，模拟人类操作
-                    # 获取二维码
-                    qrcode = page.locator(".mini-qrcode")
-                    await expect(qrcode).to_be_visible()  # 等待二维码出现
-                    # 调用回调函数，传递二维码图片地址
-                    headless_cb(await qrcode.get_attribute("src"))
-            
-            # 等待用户头像出现（等待1秒）
-            await expect(figure).to_be_visible(timeout=1000)
-        except AssertionError:
-            # 如果等待超时，继续循环检查
-            pass
+    # cookies有效时头像很快就会出现，直接等待头像即可
+    try:
+        await figure.wait_for(state="visible", timeout=2000)
+        await dump_cookies(context, cookies_path)
+        return True  # 登录成功
+    except PlaywrightTimeoutError:
+        pass
+    
+    # 步骤4: 如果是无头模式（后台运行），在后台处理二维码
+    qrcode_task = asyncio.create_task(send_qrcode(page, headless_cb)) if headless_cb else None
+    
+    # 步骤5: 等待用户头像出现（最多等待5分钟，由Playwright内部轮询检查）
+    try:
+        await expect(figure).to_be_visible(timeout=300_000)
+    except AssertionError:
+        # 5分钟后还没登录，返回False
+        return False
+    finally:
+        # 不再需要处理二维码
+        if qrcode_task:
+            qrcode_task.cancel()
+            # 等任务真正结束，避免它在页面关闭后还在操作页面
+            await asyncio.gather(qrcode_task, return_exceptions=True)
+
+    # 保存cookies，下次就不需要重新登录了
+    await dump_cookies(context, cookies_path)
+    return True  # 登录成功
+
+
+async def send_qrcode(page: Page, headless_cb: Callable[[str], None]) -> None:
+    """
+    无头模式下获取登录二维码，交给回调函数显示
     
-    # 如果300次循环后还没登录，返回False
-    return False
+    流程：等待微信登录按钮出现 → 点击 → 等待二维码出现 → 把二维码图片地址传给回调函数
+    
+    参数：
+        page: 浏览器页面对象
+        headless_cb: 无头模式回调函数（参数是二维码图片地址）
+    """
+    try:
+        wx_btn = page.locator(".wx-login-btn")  # 微信登录按钮
+        await wx_btn.wait_for(state="visible", timeout=300_000)
+        # 点击微信登录按钮
+        await wx_btn.click(delay=random.randint(32, 512))  # 随机延迟，模拟人类操作
+        # 获取二维码
+        qrcode = page.locator(".mini-qrcode")
+        await expect(qrcode).to_be_visible()  # 等待二维码出现
+        # 调用回调函数，传递二维码图片地址
+        headless_cb(await qrcode.get_attribute("src"))
+    except (PlaywrightTimeoutError, AssertionError):
+        # 没有出现登录按钮或二维码（可能已经登录），忽略
+        pass
 
 
 # ==================== 薪资解码函数 ====================
@@ -214,9 +409,83 @@ def decode_salary(salary: str) -> str:
         输入: "2" + 特殊字符 + "0-3" + 特殊字符 + "0K"
         输出: "20-30K"
     """
-    # 遍历薪资字符串中的每个字符
-    # 如果字符在映射表中，替换为对应的数字；否则保持原样
-    return "".join(salary_mapping[c] if c in salary_mapping else c for c in salary)
+    # 映射表中的字符替换为对应的数字，其他字符保持原样
+    return salary.translate(salary_table)
+
+
+# ==================== 配置文件函数 ====================
+
+@functools.lru_cache(maxsize=4)
+def load_config_cached(config_path: str, mtime: float) -> dict:
+    """
+    读取并解析配置文件（结果按 路径+修改时间 缓存）
+    
+    参数：
+        config_path: 配置文件的绝对路径
+        mtime: 配置文件的修改时间（文件修改后缓存自动失效）
+    
+    返回：
+        配置字典
+    """
+    return orjson.loads(Path(config_path).read_bytes())
+
+
+# ==================== 过滤函数 ====================
+
+class KeywordMatcher:
+    """
+    检查职位是否与搜索词相关
+    
+    搜索词按空格分割成多个关键词，要求所有关键词都出现在标题或描述中（不区分大小写）
+    
+    为什么用一个类？
+    - 所有关键词合并成一个正则表达式，每次搜索只编译一次
+    - 检查每个职位时只需要扫描一遍文本，而不是每个关键词分别在标题和描述里查找
+    
+    示例：
+        matcher = KeywordMatcher("Python 后端")
+        matcher.match("Python后端开发", "负责后端服务开发...")  # True
+    """
+
+    def __init__(self, query: Optional[str]):
+        """
+        参数：
+            query: 搜索关键词（例如："Python 后端"）
+        """
+        # 将搜索词按空格分割成多个关键词（统一转小写）
+        self._keywords = frozenset(kw.lower() for kw in str(query or "").split())
+        # (?=(...)): 在每个位置都尝试匹配，关键词之间有重叠也不会漏掉
+        # 长的关键词放在前面，同一位置优先匹配最长的关键词
+        alternation = "|".join(re.escape(kw) for kw in sorted(self._keywords, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE) if self._keywords else None
+
+    def match(self, title_text: str, desc_text: str) -> bool:
+        """
+        参数：
+            title_text: 职位名称
+            desc_text: 职位描述
+        
+        返回：
+            True: 所有关键词都找到了（或没有搜索词）
+            False: 至少有一个关键词没找到
+        """
+        if self._pattern is None:
+            return True
+        # 一次扫描找出文本中出现的所有关键词（\0 分隔标题和描述，避免跨越两段文本匹配）
+        found = {m.group(1).lower() for m in self._pattern.finditer(f"{title_text}\0{desc_text}")}
+        # 同一位置只记录最长的关键词，较短的关键词如果是它的开头部分，也算找到
+        return all(kw in found or any(f.startswith(kw) for f in found) for kw in self._keywords)
+
+
+# ==================== 异常类 ====================
+
+class ApiVerifyError(Exception):
+    """
+    接口要求安全验证时抛出的异常
+    
+    Boss直聘检测到异常访问时，接口不再返回数据，而是返回验证码（code不为0）
+    遇到这种情况时改用浏览器渲染页面的方式继续获取职位
+    """
 
 
 # ==================== Job类：表示一个职位 ====================
@@ -235,13 +504,14 @@ class Job:
     - city: 工作城市
     """
     
-    class Info(BaseModel):
+    @dataclass(slots=True)
+    class Info:
         """
-        职位信息数据模型（使用Pydantic进行数据验证）
+        职位信息数据类
         
-        什么是BaseModel？
-        - 这是Pydantic库提供的功能，用于确保数据格式正确
-        - 如果数据格式不对，会自动报错
+        为什么用dataclass？
+        - 所有字段都是从页面或接口直接得到的字符串，不需要额外的数据验证
+        - slots=True: 不为每个对象创建 __dict__，占用内存更少，创建更快
         """
         company: str  # 公司名称
         title: str    # 职位名称
@@ -281,6 +551,13 @@ class Job:
         """
         return self._info.description()
 
+    @property
+    def url(self) -> str:
+        """
+        职位链接（直接读取字段，不用转换成字典）
+        """
+        return self._info.url
+
     def model_dump(self) -> dict[str, str]:
         """
         将职位信息转换为字典格式
@@ -292,7 +569,176 @@ class Job:
         返回：
             包含职位信息的字典
         """
-        return self._info.model_dump()
+        return asdict(self._info)
+
+
+def _as_dict(job: Union[Job, dict]) -> dict:
+    """
+    把单个职位转换为字典（Job对象调用 model_dump，字典直接返回）
+    
+    参数：
+        job: Job对象或字典
+    
+    返回：
+        职位信息字典
+    """
+    if isinstance(job, Job):
+        return job.model_dump()
+    if isinstance(job, dict):
+        return job
+    # 如果格式不对，抛出错误
+    raise ValueError("jobs 必须是 Job 对象或字典")
+
+
+# ==================== 文件写入类 ====================
+
+class JobFileWriter:
+    """
+    逐个写入职位信息的文件写入器
+    
+    每得到一个职位就写入文件，不需要先把所有职位保存在内存中
+    
+    支持的格式：
+    - json: JSON数组（与一次性保存的格式完全相同）
+    - jsonl: 每行一个JSON对象（中途出错时已写入的行都是完整数据）
+    - csv: 可以用Excel打开
+    - txt: 可读性最好
+    
+    示例：
+        with JobFileWriter("jobs.json", "json") as writer:
+            for job in jobs:
+                writer.write(job.model_dump())
+    """
+    
+    # 支持的格式及其显示名称
+    format_names = {"json": "JSON格式", "jsonl": "JSONL格式", "csv": "CSV格式", "txt": "TXT格式"}
+    # CSV文件的列名
+    csv_fields = ["company", "title", "salary", "experience", "desc", "url", "city"]
+
+    def __init__(self, output_file: str, format: str = "json"):
+        """
+        打开输出文件
+        
+        参数：
+            output_file: 输出文件名
+            format: 文件格式，支持 'json', 'jsonl', 'csv', 'txt'
+        """
+        self._format = format.lower()
+        if self._format not in self.format_names:
+            # 如果格式不支持，抛出错误
+            raise ValueError(f"不支持的格式: {format}，支持 'json', 'jsonl', 'csv', 'txt'")
+        self._output_path = Path(output_file)
+        if self._format in ("json", "jsonl"):
+            # orjson直接生成UTF-8字节，以二进制方式写入
+            self._file = open(self._output_path, "wb")
+        else:
+            # newline="": CSV写入器自己处理换行
+            self._file = open(self._output_path, "w", encoding="utf-8", newline="" if self._format == "csv" else None)
+        # 已写入的职位数量
+        self.count = 0
+        if self._format == "csv":
+            # 创建CSV写入器，先写入表头（包含experience字段）
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=self.csv_fields)
+            self._csv_writer.writeheader()
+
+    def write(self, job: dict) -> None:
+        """
+        写入一个职位
+        
+        参数：
+            job: 职位信息字典
+        """
+        self.count += 1
+        f = self._file
+        if self._format == "json":
+            # 数组的开头或元素之间的分隔，每个职位整体缩进2个空格（与 json.dump(indent=2) 的格式相同）
+            # orjson直接输出中文字符，不需要 ensure_ascii=False
+            f.write(b"[\n  " if self.count == 1 else b",\n  ")
+            f.write(orjson.dumps(job, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+        elif self._format == "jsonl":
+            f.write(orjson.dumps(job) + b"\n")
+        elif self._format == "csv":
+            self._csv_writer.writerow(job)
+        else:
+            # TXT格式：格式化写入
+            f.write(f"{'='*60}\n")  # 分隔线
+            f.write(f"职位 #{self.count}\n")  # 职位编号
+            f.write(f"{'='*60}\n")
+            f.write(f"公司: {job['company']}\n")
+            f.write(f"职位: {job['title']}\n")
+            f.write(f"薪资: {job['salary']}\n")
+            f.write(f"工作年限: {job.get('experience', '不限')}\n")
+            f.write(f"城市: {job.get('city', '未知')}\n")
+            f.write(f"链接: {job['url']}\n")
+            f.write(f"\n职位描述:\n{job['desc']}\n")
+            f.write(f"\n{'='*60}\n\n")
+
+    def close(self, completed: bool = True) -> None:
+        """
+        结束写入并关闭文件
+
+        参数：
+            completed: 是否正常写完；为False时（写入过程中出错）只提示已写入的部分
+        """
+        if self._format == "json":
+            # 补上数组的结尾，保证已写入的部分仍是合法的JSON
+            self._file.write(b"\n]" if self.count else b"[]")
+        self._file.close()
+        if completed:
+            print(f"✓ 已保存 {self.count} 个职位到: {self._output_path} ({self.format_names[self._format]})")
+        else:
+            print(f"✗ 保存中断，已写入 {self.count} 个职位到: {self._output_path} ({self.format_names[self._format]})")
+
+    def __enter__(self) -> "JobFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(completed=exc_type is None)
+
+
+# ==================== 队列函数 ====================
+
+async def _drain(out_q: asyncio.Queue, n_producers: int) -> AsyncGenerator[Job, None]:
+    """
+    从结果队列中逐个取出职位
+    
+    每个生产协程结束时会放入一个None；收到n_producers个None后结束
+    如果取到的是异常（某个协程出错），直接抛出
+    
+    参数：
+        out_q: 结果队列
+        n_producers: 向队列放入结果的协程数量
+    """
+    finished = 0
+    while finished < n_producers:
+        item = await out_q.get()
+        if item is None:
+            finished += 1
+        elif isinstance(item, Exception):
+            raise item
+        else:
+            yield item
+
+
+async def _pump(jobs: AsyncIterator[Job], out_q: asyncio.Queue) -> None:
+    """
+    把一个职位异步生成器的结果全部放入结果队列（与 _drain 配合，合并多个搜索的结果）
+    
+    出错时把异常放进队列；结束（或被取消）时关闭生成器并放入一个None
+    
+    参数：
+        jobs: 职位异步生成器
+        out_q: 结果队列
+    """
+    try:
+        async for job in jobs:
+            await out_q.put(job)
+    except Exception as e:
+        await out_q.put(e)
+    finally:
+        # 关闭生成器，让它释放打开的页面
+        await jobs.aclose()
+        out_q.put_nowait(None)
 
 
 # ==================== BossZhipin类：主要的爬虫类 ====================
@@ -306,23 +752,105 @@ class BossZhipin:
     2. 搜索职位
     3. 提取职位信息
     4. 保存职位信息到本地文件
+    
+    推荐用 async with 使用，多次搜索共用同一个浏览器和登录状态：
+        async with BossZhipin() as boss:
+            async for job in boss.query_jobs("Python", "101010100"):
+                print(job.model_dump())
     """
     
     # cookies文件路径
     _cookies_path: Path
 
-    def __init__(self, cookies_path: str = "cookies.json", headless_cb: Optional[Callable[[str], None]] = None):
+    def __init__(self, cookies_path: str = "cookies.db", headless_cb: Optional[Callable[[str], None]] = None, stealth_level: int = 2):
         """
         初始化BossZhipin对象
         
         参数：
-            cookies_path: cookies文件路径（默认"cookies.json"）
+            cookies_path: cookies数据库路径（默认"cookies.db"）
             headless_cb: 无头模式回调函数（一般不需要）
+            stealth_level: 模拟用户操作的停留程度（默认2）
+                - 2: 完整的随机停留，最不容易被识别为爬虫
+                - 1: 停留时间减半
+                - 0: 不停留（速度最快，被限制访问时请调回2）
         """
         # 将字符串路径转换为Path对象，并解析为绝对路径
         self._cookies_path = Path(cookies_path).resolve()
         # 保存无头模式回调函数
         self._headless_cb = headless_cb
+        # 浏览器相关对象（在 __aenter__ 中创建，多次搜索共用）
+        self._pw: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        # 是否登录成功
+        self._logged_in = False
+        # 调用接口的HTTP会话（登录成功后创建）
+        self._api_session: Optional[AsyncSession] = None
+        # 限制同时进行的接口请求数量（在 __aenter__ 中创建，绑定当前的事件循环）
+        self._api_semaphore: Optional[asyncio.Semaphore] = None
+        # 模拟用户操作的停留程度
+        self._stealth_level = stealth_level
+        # 已经获取过的职位链接（保存在cookies文件旁边的 seen_urls.txt，删除该文件即可重新获取所有职位）
+        self._seen_path = self._cookies_path.with_name("seen_urls.txt")
+        self._seen_urls: Set[str] = set(self._seen_path.read_text(encoding="utf-8").splitlines()) if self._seen_path.exists() else set()
+        self._seen_file: Optional[TextIO] = None
+
+    async def __aenter__(self) -> "BossZhipin":
+        """
+        启动浏览器并登录（只执行一次，之后的搜索都共用这个浏览器）
+        
+        返回：
+            BossZhipin对象本身
+        """
+        try:
+            # 步骤1: 启动浏览器
+            self._pw = await async_playwright().start()
+            # headless: 是否无头模式（True=后台运行，False=显示浏览器窗口）
+            # args: 浏览器参数，用于隐藏自动化标识
+            self._browser = await self._pw.chromium.launch(
+                headless = True if self._headless_cb else False,
+                args = ["--disable-blink-features=AutomationControlled"]  # 隐藏自动化标识
+            )
+            # 创建浏览器上下文（可以理解为浏览器的一个会话）
+            self._context = await self._browser.new_context()
+            # 打开已获取职位文件（追加模式，每写一行立即保存）
+            self._seen_file = open(self._seen_path, "a", encoding="utf-8", buffering=1)
+            
+            # 步骤2: 登录
+            page = await self._context.new_page()
+            self._logged_in = await login(self._context, page, self._cookies_path, self._headless_cb)
+            await page.close()
+            
+            # 登录完成后再拦截图片等资源（登录时需要显示二维码图片）
+            await self._context.route("**/*", block_resources)
+            
+            # 步骤3: 把登录cookies复制到接口会话
+            # impersonate="chrome124": 使用Chrome的TLS指纹，避免被识别为爬虫
+            if self._logged_in:
+                self._api_session = AsyncSession(impersonate="chrome124")
+                # 每次启动都新建，同一个对象可以在多次 asyncio.run 中使用
+                self._api_semaphore = asyncio.Semaphore(detail_workers)
+                await copy_cookies_to_session(self._context, self._api_session)
+        except BaseException:
+            # 启动失败时释放已经创建的资源
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """
+        关闭接口会话和浏览器
+        """
+        if self._api_session:
+            await self._api_session.close()
+        if self._browser:
+            await self._browser.close()
+        if self._pw:
+            await self._pw.stop()
+        if self._seen_file:
+            self._seen_file.close()
+        self._pw = self._browser = self._context = self._api_session = self._api_semaphore = self._seen_file = None
+        self._logged_in = False
 
     @staticmethod
     def load_config(config_path: str = "search_config.json") -> dict:
@@ -333,7 +861,7 @@ class BossZhipin:
             config_path: 配置文件路径（默认"search_config.json"）
         
         返回：
-            包含搜索参数的字典
+            包含搜索参数的字典（文件没有修改时返回缓存的同一个字典，请不要修改它）
         
         示例：
             config = BossZhipin.load_config("search_config.json")
@@ -343,25 +871,24 @@ class BossZhipin:
         if not config_file.exists():
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
         
-        with open(config_file, "r", encoding="utf-8") as f:
-            config = json.load(f)
-        
-        return config
+        # 以文件修改时间作为缓存的一部分：文件没变时直接使用上次的解析结果
+        return load_config_cached(str(config_file.resolve()), config_file.stat().st_mtime)
 
     @staticmethod
-    def save_jobs(jobs: Union[List[Job], List[dict]], output_file: str = "jobs_data.json", format: str = "json") -> None:
+    def save_jobs(jobs: Iterable[Union[Job, dict]], output_file: str = "jobs_data.json", format: str = "json") -> None:
         """
         保存职位信息到本地文件
         
-        支持三种格式：
+        支持四种格式：
         1. JSON格式：结构化数据，便于程序处理
-        2. CSV格式：可以用Excel打开，便于查看和分析
-        3. TXT格式：纯文本格式，可读性最好
+        2. JSONL格式：每行一个职位，便于逐行读取
+        3. CSV格式：可以用Excel打开，便于查看和分析
+        4. TXT格式：纯文本格式，可读性最好
         
         参数：
-            jobs: Job对象列表或字典列表
+            jobs: Job对象或字典组成的列表（也可以是生成器，两种可以混合）
             output_file: 输出文件名
-            format: 文件格式，支持 'json', 'csv', 'txt'
+            format: 文件格式，支持 'json', 'jsonl', 'csv', 'txt'
         
         示例：
             # 保存为JSON格式
@@ -373,79 +900,60 @@ class BossZhipin:
             # 保存为TXT格式（可读性最好）
             BossZhipin.save_jobs(jobs_list, "jobs.txt", format="txt")
         """
-        # 检查是否有职位数据
-        if not jobs:
+        # 步骤1: 检查是否有职位数据
+        # 取出第一个职位来判断（生成器没有长度，不能用 if not jobs 判断）
+        jobs_iter = iter(jobs)
+        first = next(jobs_iter, None)
+        if first is None:
             print("没有职位数据需要保存")
             return
         
-        # 将字符串路径转换为Path对象
-        output_path = Path(output_file)
+        # 第一个职位先转换（数据类型不对时，在创建文件之前就报错）
+        first = _as_dict(first)
         
-        # 步骤1: 统一转换为字典列表
-        # 如果输入是Job对象列表，转换为字典列表
-        if isinstance(jobs[0], Job):
-            jobs_data = [job.model_dump() for job in jobs]
-        # 如果输入已经是字典列表，直接使用
-        elif isinstance(jobs[0], dict):
-            jobs_data = jobs
-        else:
-            # 如果格式不对，抛出错误
-            raise ValueError("jobs 必须是 Job 对象列表或字典列表")
-        
-        # 步骤2: 根据格式保存文件
-        if format.lower() == "json":
-            # JSON格式：结构化数据，便于程序处理
-            with open(output_path, "w", encoding="utf-8") as f:
-                # ensure_ascii=False: 允许中文字符
-                # indent=2: 缩进2个空格，让文件更易读
-                json.dump(jobs_data, f, ensure_ascii=False, indent=2)
-            print(f"✓ 已保存 {len(jobs_data)} 个职位到: {output_path} (JSON格式)")
-            
-        elif format.lower() == "csv":
-            # CSV格式：可以用Excel打开
-            with open(output_path, "w", encoding="utf-8", newline="") as f:
-                # 创建CSV写入器，指定列名（包含experience字段）
-                writer = csv.DictWriter(f, fieldnames=["company", "title", "salary", "experience", "desc", "url", "city"])
-                writer.writeheader()  # 写入表头
-                # 逐行写入职位数据
-                for job in jobs_data:
-                    writer.writerow(job)
-            print(f"✓ 已保存 {len(jobs_data)} 个职位到: {output_path} (CSV格式)")
-            
-        elif format.lower() == "txt":
-            # TXT格式：可读性最好
-            with open(output_path, "w", encoding="utf-8") as f:
-                # 遍历每个职位，格式化写入
-                for i, job in enumerate(jobs_data, 1):
-                    f.write(f"{'='*60}\n")  # 分隔线
-                    f.write(f"职位 #{i}\n")  # 职位编号
-                    f.write(f"{'='*60}\n")
-                    f.write(f"公司: {job['company']}\n")
-                    f.write(f"职位: {job['title']}\n")
-                    f.write(f"薪资: {job['salary']}\n")
-                    f.write(f"工作年限: {job.get('experience', '不限')}\n")
-                    f.write(f"城市: {job.get('city', '未知')}\n")
-                    f.write(f"链接: {job['url']}\n")
-                    f.write(f"\n职位描述:\n{job['desc']}\n")
-                    f.write(f"\n{'='*60}\n\n")
-            print(f"✓ 已保存 {len(jobs_data)} 个职位到: {output_path} (TXT格式)")
-            
-        else:
-            # 如果格式不支持，抛出错误
-            raise ValueError(f"不支持的格式: {format}，支持 'json', 'csv', 'txt'")
+        # 步骤2: 逐个转换为字典并写入文件（Job对象和字典可以混合）
+        with JobFileWriter(output_file, format) as writer:
+            writer.write(first)
+            for job in jobs_iter:
+                writer.write(_as_dict(job))
+
+    @staticmethod
+    async def stream_jobs_to_file(jobs: AsyncIterator[Job], output_file: str = "jobs_data.json", format: str = "json") -> int:
+        """
+        边搜索边保存职位信息（每得到一个职位就写入文件）
+        
+        和 save_jobs 的区别：
+        - save_jobs 需要先把所有职位放到列表里再保存
+        - 这个方法直接接收 query_jobs 返回的异步生成器，不需要在内存中保存所有职位
+        - 中途出错时，已经得到的职位也已经写入文件（JSONL格式每一行都是完整数据）
+        
+        参数：
+            jobs: 职位对象的异步生成器（例如 boss.query_jobs(...) 的返回值）
+            output_file: 输出文件名
+            format: 文件格式，支持 'json', 'jsonl', 'csv', 'txt'
+        
+        返回：
+            保存的职位数量
+        
+        示例：
+            async with BossZhipin() as boss:
+                await BossZhipin.stream_jobs_to_file(boss.query_jobs("Python", "101010100"), "jobs.jsonl", format="jsonl")
+        """
+        with JobFileWriter(output_file, format) as writer:
+            async for job in jobs:
+                writer.write(job.model_dump())
+        return writer.count
 
-    async def query_jobs(self, query: str, city: str, salary: Optional[str] = None, experience: Optional[str] = None, degree: Optional[str] = None, scroll_n: int = 8, filter_tags: Optional[Set[str]] = None, blacklist: Optional[Set[str]] = None) -> AsyncGenerator[Job, None]:
+    async def query_jobs(self, query: str, city: str, salary: Optional[str] = None, experience: Optional[str] = None, degree: Optional[str] = None, scroll_n: int = 8, filter_tags: Optional[AbstractSet[str]] = None, blacklist: Optional[AbstractSet[str]] = None, page: Optional[Page] = None) -> AsyncGenerator[Job, None]:
         """
         搜索职位并提取职位信息
         
         工作流程：
-        1. 启动浏览器
-        2. 登录（如果未登录）
-        3. 访问搜索页面
-        4. 滚动页面加载更多职位
-        5. 遍历每个职位，提取信息
-        6. 过滤不符合条件的职位
-        7. 返回职位对象
+        1. 启动浏览器并登录（如果还没有通过 async with 启动）
+        2. 通过职位列表接口和职位详情接口获取职位（不需要渲染页面，速度快）
+        3. 如果接口要求安全验证，改用浏览器访问搜索页面，逐个点击职位提取信息
+        4. 过滤不符合条件的职位
+        5. 返回职位对象
         
         参数：
             query: 搜索关键词（例如："Python开发"）
@@ -453,9 +961,10 @@ class BossZhipin:
             salary: 薪资范围（可选，例如："103"表示10K-15K）
             experience: 工作经验（可选，例如："106"表示1-3年）
             degree: 学历要求（可选，例如："205"表示本科）
-            scroll_n: 滚动加载次数（默认8次，滚动越多加载的职位越多）
+            scroll_n: 加载次数（默认8次；接口模式下为翻页数，浏览器模式下为滚动次数）
             filter_tags: 过滤标签（可选，例如：{"急招"}表示过滤掉"急招"标签的职位）
             blacklist: 公司黑名单（可选，例如：{"某公司"}表示过滤掉这个公司的职位）
+            page: 浏览器模式使用的页面（可选，不传时需要用到才新建，用完关闭）
         
         返回：
             职位对象的异步生成器（可以逐个获取职位）
@@ -464,378 +973,546 @@ class BossZhipin:
             async for job in boss.query_jobs("Python", "100010000"):
                 print(job.model_dump())
         """
+        # 如果没有用 async with 启动浏览器，临时启动一次（本次搜索结束后关闭）
+        if self._context is None:
+            async with self:
+                async for job in self.query_jobs(query, city, salary, experience, degree, scroll_n, filter_tags, blacklist, page):
+                    yield job
+            return
+        
+        # 返回的职位都记录到已获取列表，之后（包括切换到浏览器模式、下次运行）不再重复获取
+        async for job in self._search_jobs(query, city, salary, experience, degree, scroll_n, filter_tags, blacklist, page):
+            try:
+                yield job
+            finally:
+                # 调用方拿到职位之后才记录（提前结束时，还没返回的职位下次仍会获取）
+                self._mark_seen(job.url)
+
+    async def _search_jobs(self, query: str, city: str, salary: Optional[str], experience: Optional[str], degree: Optional[str], scroll_n: int, filter_tags: Optional[AbstractSet[str]], blacklist: Optional[AbstractSet[str]], page: Optional[Page]) -> AsyncGenerator[Job, None]:
+        """
+        搜索职位：优先通过接口获取，接口要求验证时改用浏览器（不记录已获取的职位，由调用方在返回职位后记录）
+        
+        参数：与 query_jobs 相同
+        """
+        # 登录失败，直接返回
+        if not self._logged_in:
+            return
+        
+        try:
+            # 优先通过接口获取职位
+            async for job in self._query_jobs_api(query, city, salary, experience, degree, scroll_n, filter_tags, blacklist):
+                # 已经返回过的职位（例如接口重复返回同一个职位），跳过
+                if job.url in self._seen_urls:
+                    continue
+                yield job
+        except ApiVerifyError:
+            # 接口要求安全验证，在共用的浏览器中打开新页面继续获取（调用方传入了页面时直接使用）
+            browser_page = page or await self._context.new_page()
+            try:
+                async for job in self._query_jobs_browser(browser_page, query, city, salary, experience, degree, scroll_n, filter_tags, blacklist):
+                    if job.url in self._seen_urls:
+                        continue
+                    yield job
+            finally:
+                # 只关闭自己新建的页面
+                if page is None:
+                    await browser_page.close()
+
+    def _mark_seen(self, url: str) -> None:
+        """
+        记录已经获取过的职位链接（同时追加到文件，下次运行时跳过这些职位）
+        
+        参数：
+            url: 职位链接
+        """
+        if url and url not in self._seen_urls:
+            self._seen_urls.add(url)
+            if self._seen_file:
+                self._seen_file.write(url + "\n")
+
+    async def _dwell(self, low: int, high: int) -> None:
+        """
+        模拟用户操作的随机停留
+        
+        停留时间按 stealth_level 缩放：2=原始时间，1=一半，0=不停留
+        
+        参数：
+            low: 最短停留时间（毫秒，stealth_level为2时）
+            high: 最长停留时间（毫秒，stealth_level为2时）
+        """
+        if self._stealth_level:
+            await asyncio.sleep(random.randint(low, high) * self._stealth_level / 2000)
+
+    async def _api_get(self, path: str, params: dict, headers: Optional[dict] = None) -> dict:
+        """
+        调用Boss直聘接口并返回数据部分（zpData）
+        
+        参数：
+            path: 接口路径（例如：joblist_api）
+            params: 请求参数
+            headers: 额外的请求头（可选，例如Referer）
+        
+        返回：
+            接口返回的zpData字典
+        
+        异常：
+            ApiVerifyError: 接口要求安全验证（或没有返回正常数据）
+        """
+        resp = await self._api_session.get(f"{base_url}{path}", params=params, headers=headers)
+        try:
+            data = resp.json() if resp.status_code == 200 else {}
+        except ValueError:
+            # 返回的不是JSON（通常是验证页面）
+            data = {}
+        # code为0表示请求成功，其他值表示需要验证或出错
+        if data.get("code") != 0 or not data.get("zpData"):
+            raise ApiVerifyError(data.get("message") or f"HTTP {resp.status_code}")
+        return data["zpData"]
+
+    async def _query_jobs_api(self, query: str, city: str, salary: Optional[str], experience: Optional[str], degree: Optional[str], scroll_n: int, filter_tags: Optional[AbstractSet[str]], blacklist: Optional[AbstractSet[str]]) -> AsyncGenerator[Job, None]:
+        """
+        通过接口搜索职位（不渲染页面）
+        
+        工作流程：
+        1. 逐页调用职位列表接口，把职位放入待处理队列
+        2. 多个工作协程同时从队列取出职位，调用职位详情接口（网络等待时间互相重叠）
+        3. 过滤不符合条件的职位，把结果放入结果队列
+        4. 从结果队列逐个返回职位
+        
+        接口返回的薪资是普通文本，不需要用 decode_salary 解码
+        
+        参数：与 query_jobs 相同
+        
+        异常：
+            ApiVerifyError: 接口要求安全验证
+        """
         # 从城市代码获取城市名称（作为默认值）
         default_city = city_code_mapping.get(city, "未知")
-        # 步骤1: 启动浏览器
-        async with async_playwright() as p:
-            # 启动Chromium浏览器
-            # headless: 是否无头模式（True=后台运行，False=显示浏览器窗口）
-            # args: 浏览器参数，用于隐藏自动化标识
-            browser = await p.chromium.launch(
-                headless = True if self._headless_cb else False,
-                args = ["--disable-blink-features=AutomationControlled"]  # 隐藏自动化标识
-            )
-            # 创建浏览器上下文（可以理解为浏览器的一个会话）
-            context = await browser.new_context()
-            # 创建新页面
-            page = await context.new_page()
-            
-            # 步骤2: 登录（如果登录失败，直接返回）
-            if not await login(context, page, self._cookies_path, self._headless_cb):
-                return  # 登录失败，退出函数
-            
-            # 步骤3: 构建搜索URL并访问
-            # 构建搜索参数（基础参数：关键词和城市）
-            params = dict(query=query, city=city)
-            # 如果指定了薪资范围，添加到参数中
+        
+        # 构建搜索参数（基础参数：关键词、城市、每页数量）
+        # scene=1 与网页前端发出的请求保持一致
+        params = dict(scene=1, query=query, city=city, pageSize=30)
+        if salary:
+            params["salary"] = salary
+        if experience:
+            params["experience"] = experience
+        if degree:
+            params["degree"] = degree
+        # 前端请求职位列表时带的Referer是搜索页面地址
+        headers = {"Referer": f"{base_url}/web/geek/jobs?{urlencode(dict(query=query, city=city), quote_via=quote)}"}
+        
+        # 关键词匹配器（每次搜索只编译一次）
+        matcher = KeywordMatcher(query)
+        
+        # 待获取详情的职位队列 和 处理结果队列
+        job_q: asyncio.Queue = asyncio.Queue()
+        out_q: asyncio.Queue = asyncio.Queue()
+        
+        # 启动职位列表协程和详情工作协程
+        tasks = [asyncio.create_task(self._list_worker(params, headers, scroll_n, filter_tags, default_city, blacklist, job_q, out_q))]
+        for _ in range(detail_workers):
+            tasks.append(asyncio.create_task(self._detail_worker(job_q, out_q, matcher, default_city, blacklist)))
+        
+        try:
+            # 每个协程结束时都会放入一个None，全部结束后停止
+            async for job in _drain(out_q, len(tasks)):
+                yield job
+        finally:
+            # 提前结束（或出错）时取消还在运行的协程，并等待它们结束（避免在会话关闭后还有请求在进行）
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _list_worker(self, params: dict, headers: dict, scroll_n: int, filter_tags: Optional[AbstractSet[str]], default_city: str, blacklist: Optional[AbstractSet[str]], job_q: asyncio.Queue, out_q: asyncio.Queue) -> None:
+        """
+        职位列表协程：逐页调用职位列表接口，把职位放入待处理队列，直到没有更多职位
+        
+        只用列表数据就能判断的条件（标签、公司、城市）在这里先检查，
+        不符合的职位不会再请求详情
+        
+        参数：
+            params: 搜索参数
+            headers: 请求头（Referer）
+            scroll_n: 最多翻页数
+            filter_tags: 过滤标签
+            default_city: 搜索的城市名称
+            blacklist: 公司黑名单
+            job_q: 待获取详情的职位队列
+            out_q: 结果队列（出错时把异常放进去，交给调用方抛出）
+        """
+        try:
+            for page_idx in range(1, scroll_n + 1):
+                params["page"] = page_idx
+                zp_data = await self._api_get(joblist_api, params, headers)
+                
+                for item in zp_data.get("jobList") or []:
+                    # 过滤标签检查
+                    if filter_tags and item.get("iconWord") in filter_tags:
+                        continue
+                    # 猎头过滤和黑名单检查（列表数据里已经有公司名称）
+                    company_name = item.get("brandName", "")
+                    if "某" in company_name or (blacklist and company_name in blacklist):
+                        continue
+                    # 城市过滤（列表数据里有城市时才检查）
+                    if item.get("cityName", default_city) != default_city:
+                        continue
+                    # 已经获取过的职位，跳过（不用再请求详情）
+                    if f"{base_url}/job_detail/{item['encryptJobId']}.html" in self._seen_urls:
+                        continue
+                    await job_q.put(item)
+                
+                # 没有更多职位，结束
+                if not zp_data.get("hasMore"):
+                    break
+        except Exception as e:
+            await out_q.put(e)
+        finally:
+            # 每个详情工作协程收到一个None后结束
+            for _ in range(detail_workers):
+                job_q.put_nowait(None)
+            out_q.put_nowait(None)
+
+    async def _detail_worker(self, job_q: asyncio.Queue, out_q: asyncio.Queue, matcher: KeywordMatcher, default_city: str, blacklist: Optional[AbstractSet[str]]) -> None:
+        """
+        详情工作协程：从队列取出职位，调用职位详情接口，过滤后放入结果队列
+        
+        参数：
+            job_q: 待获取详情的职位队列（取到None时结束）
+            out_q: 结果队列
+            matcher: 关键词匹配器
+            default_city: 搜索的城市名称
+            blacklist: 公司黑名单
+        """
+        try:
+            while (item := await job_q.get()) is not None:
+                async with self._api_semaphore:
+                    # 请求间隔：模拟用户浏览（500-1500毫秒），各个工作协程的等待同时进行
+                    await self._dwell(500, 1500)
+                    # 获取职位详情
+                    detail = await self._api_get(job_detail_api, {"securityId": item["securityId"], "lid": item.get("lid", "")})
+                
+                job = self._build_api_job(item, detail, matcher, default_city, blacklist)
+                if job:
+                    await out_q.put(job)
+        except Exception as e:
+            await out_q.put(e)
+        finally:
+            out_q.put_nowait(None)
+
+    @staticmethod
+    def _build_api_job(item: dict, detail: dict, matcher: KeywordMatcher, default_city: str, blacklist: Optional[AbstractSet[str]]) -> Optional[Job]:
+        """
+        根据接口返回的列表数据和详情数据创建职位对象
+        
+        参数：
+            item: 职位列表接口返回的单个职位
+            detail: 职位详情接口返回的数据
+            matcher: 关键词匹配器
+            default_city: 搜索的城市名称
+            blacklist: 公司黑名单
+        
+        返回：
+            职位对象；不符合条件时返回None
+        """
+        job_info = detail.get("jobInfo") or {}
+        boss_info = detail.get("bossInfo") or {}
+        
+        # 检查HR活跃时间（周/月/年说明HR可能不活跃，跳过这个职位）
+        if inactive_pattern.search(boss_info.get("activeTimeDesc") or ""):
+            return None
+        
+        company_name = item.get("brandName") or (detail.get("brandComInfo") or {}).get("brandName", "")
+        title_text = job_info.get("jobName") or item.get("jobName", "")
+        desc_text = job_info.get("postDescription", "")
+        job_city = item.get("cityName") or default_city
+        
+        # 城市过滤、猎头过滤、黑名单检查（列表数据缺少字段时在这里补充检查）
+        if job_city != default_city:
+            return None
+        if "某" in company_name:
+            return None
+        if blacklist and company_name in blacklist:
+            return None
+        # 关键词过滤（需要扫描职位描述，放在最后）
+        if not matcher.match(title_text, desc_text):
+            return None
+        
+        return Job(Job.Info(
+            company = company_name,  # 公司名称
+            title = title_text,  # 职位名称
+            salary = job_info.get("salaryDesc") or item.get("salaryDesc", ""),  # 薪资（普通文本）
+            experience = job_info.get("experienceName") or item.get("jobExperience") or "不限",  # 工作年限要求
+            desc = desc_text,  # 职位描述
+            url = f"{base_url}/job_detail/{item['encryptJobId']}.html",  # 职位链接（完整URL）
+            city = job_city,  # 工作城市
+        ))
+
+    async def _query_jobs_browser(self, page: Page, query: str, city: str, salary: Optional[str], experience: Optional[str], degree: Optional[str], scroll_n: int, filter_tags: Optional[AbstractSet[str]], blacklist: Optional[AbstractSet[str]]) -> AsyncGenerator[Job, None]:
+        """
+        通过浏览器渲染搜索页面获取职位（接口要求验证时使用）
+        
+        工作流程：
+        1. 访问搜索页面
+        2. 滚动页面加载更多职位
+        3. 遍历每个职位，点击后从详情页提取信息
+        4. 过滤不符合条件的职位
+        
+        参数：
+            page: 已登录的浏览器页面
+            其他参数与 query_jobs 相同
+        """
+        # 从城市代码获取城市名称（作为默认值）
+        default_city = city_code_mapping.get(city, "未知")
+        # 关键词匹配器（每次搜索只编译一次）
+        matcher = KeywordMatcher(query)
+        
+        # 步骤1: 构建搜索URL并访问
+        # 构建搜索参数（基础参数：关键词和城市）
+        params = dict(query=query, city=city)
+        # 如果指定了薪资范围，添加到参数中
+        if salary:
+            params["salary"] = salary
+        # 如果指定了工作经验，添加到参数中
+        if experience:
+            params["experience"] = experience
+        # 如果指定了学历要求，添加到参数中
+        if degree:
+            params["degree"] = degree
+        # 访问搜索页面
+        # urlencode: 将参数编码为URL格式
+        # 页面结构加载完成即可，后面会等待职位列表容器出现
+        await page.goto(f"{base_url}/web/geek/jobs?{urlencode(params, quote_via=quote)}", wait_until="domcontentloaded")
+
+        # 尝试在页面上应用筛选：薪资/经验/学历（有些筛选不会通过URL参数生效）
+        try:
+            # 可能的筛选区域容器选择器集合
+            filter_containers = [
+                ".filter-wrapper",
+                ".search-condition-wrapper",
+                ".condition-box",
+                ".search-job-condition",
+            ]
+            filter_container: Optional[Locator] = None
+            for sel in filter_containers:
+                c = page.locator(sel)
+                if await c.count() > 0 and await c.first.is_visible():
+                    filter_container = c.first
+                    break
+
+            async def click_option(texts: list[str]) -> None:
+                if not filter_container:
+                    return
+                for t in texts:
+                    try:
+                        opt = page.get_by_text(t, exact=True)
+                        if await opt.count() > 0:
+                            await opt.first.click()
+                            # 等待内容刷新
+                            await page.wait_for_timeout(300)
+                            # 筛选后停留：模拟用户查看筛选结果（800-1500毫秒）
+                            await self._dwell(800, 1500)
+                            break
+                    except:
+                        continue
+
+            # 薪资筛选
             if salary:
-                params["salary"] = salary
-            # 如果指定了工作经验，添加到参数中
+                salary_text = salary_code_to_text.get(str(salary))
+                if salary_text:
+                    await click_option([salary_text])
+
+            # 经验筛选
             if experience:
-                params["experience"] = experience
-            # 如果指定了学历要求，添加到参数中
-            if degree:
-                params["degree"] = degree
-            # 访问搜索页面
-            # urlencode: 将参数编码为URL格式
-            await page.goto(f"{base_url}/web/geek/jobs?{urlencode(params, quote_via=quote)}")
+                exp_text = experience_code_to_text.get(str(experience))
+                if exp_text:
+                    await click_option([exp_text])
 
-            # 尝试在页面上应用筛选：薪资/经验/学历（有些筛选不会通过URL参数生效）
-            try:
-                # 可能的筛选区域容器选择器集合
-                filter_containers = [
-                    ".filter-wrapper",
-                    ".search-condition-wrapper",
-                    ".condition-box",
-                    ".search-job-condition",
-                ]
-                filter_container: Optional[Locator] = None
-                for sel in filter_containers:
-                    c = page.locator(sel)
-                    if await c.count() > 0 and await c.first.is_visible():
-                        filter_container = c.first
-                        break
-
-                async def click_option(texts: list[str]) -> None:
-                    if not filter_container:
-                        return
-                    for t in texts:
-                        try:
-                            opt = page.get_by_text(t, exact=True)
-                            if await opt.count() > 0:
-                                await opt.first.click()
-                                # 等待内容刷新
-                                await page.wait_for_timeout(300)
-                                # 筛选后停留：模拟用户查看筛选结果（800-1500毫秒）
-                                await page.wait_for_timeout(random.randint(800, 1500))
-                                break
-                        except:
-                            continue
-
-                # 薪资筛选
-                if salary:
-                    salary_text = salary_code_to_text.get(str(salary))
-                    if salary_text:
-                        await click_option([salary_text])
-
-                # 经验筛选
-                if experience:
-                    exp_text = experience_code_to_text.get(str(experience))
-                    if exp_text:
-                        await click_option([exp_text])
-
-                # 学历筛选
-                if degree:
-                    deg_text = degree_code_to_text.get(str(degree))
-                    if deg_text:
-                        await click_option([deg_text])
-            except:
-                # 忽略筛选点击失败，继续以页面显示为准
-                pass
-            
-            # 步骤4: 滚动页面加载更多职位
-            prev_h = 0  # 记录上一次的页面高度
-            container = page.locator(".job-list-container")  # 职位列表容器
-            await expect(container).to_be_visible()  # 等待容器出现
-            await container.hover()  # 鼠标悬停在容器上
+            # 学历筛选
+            if degree:
+                deg_text = degree_code_to_text.get(str(degree))
+                if deg_text:
+                    await click_option([deg_text])
+        except:
+            # 忽略筛选点击失败，继续以页面显示为准
+            pass
+        
+        # 步骤2: 滚动页面加载更多职位
+        prev_h = 0  # 记录上一次的页面高度
+        container = page.locator(".job-list-container")  # 职位列表容器
+        await expect(container).to_be_visible()  # 等待容器出现
+        await container.hover()  # 鼠标悬停在容器上
+        # 获取容器元素的句柄，之后直接读取它的内容高度
+        container_handle = await container.element_handle()
+        
+        # 初始停留：模拟用户查看页面（1-2秒）
+        await self._dwell(1000, 2000)
+        
+        # 循环滚动scroll_n次
+        for _ in range(scroll_n):
+            # 读取容器的内容高度（比获取边界框开销小，不会强制重新计算页面布局）
+            h = await container_handle.evaluate("el => el.scrollHeight")
+            # 向下滚动（滚动距离 = 当前高度 - 之前的高度）
+            await page.mouse.wheel(0, h - prev_h)
             
-            # 初始停留：模拟用户查看页面（1-2秒）
-            await page.wait_for_timeout(random.randint(1000, 2000))
+            # 滚动后停留：模拟用户浏览职位列表（1.5-3秒）
+            await self._dwell(1500, 3000)
             
-            # 循环滚动scroll_n次
-            for _ in range(scroll_n):
-                # 获取容器的边界框（位置和大小）
-                bbox = await container.bounding_box()
-                # 向下滚动（滚动距离 = 当前高度 - 之前的高度）
-                await page.mouse.wheel(0, bbox["height"] - prev_h)
+            # 等待加载动画
+            loading = container.locator(".loading-wait")
+            try:
+                # 等待加载动画出现
+                await expect(loading).to_be_visible()
+                # 等待加载动画消失（表示加载完成）
+                await expect(loading).to_be_hidden()
                 
-                # 滚动后停留：模拟用户浏览职位列表（1.5-3秒）
-                await page.wait_for_timeout(random.randint(1500, 3000))
+                # 加载完成后短暂停留（500-1000毫秒）
+                await self._dwell(500, 1000)
                 
-                # 等待加载动画
-                loading = container.locator(".loading-wait")
-                try:
-                    # 等待加载动画出现
-                    await expect(loading).to_be_visible()
-                    # 等待加载动画消失（表示加载完成）
-                    await expect(loading).to_be_hidden()
-                    
-                    # 加载完成后短暂停留（500-1000毫秒）
-                    await page.wait_for_timeout(random.randint(500, 1000))
-                    
-                    # 如果页面高度增加了，说明加载了新内容
-                    if bbox["height"] > prev_h:
-                        prev_h = bbox["height"]  # 更新之前的高度
-                    else:
-                        # 如果高度没变，说明没有更多内容了，退出循环
-                        break
-                except AssertionError:
-                    # 如果加载动画没有出现，说明已经加载完所有内容，退出循环
+                # 如果页面高度增加了，说明加载了新内容
+                if h > prev_h:
+                    prev_h = h  # 更新之前的高度
+                else:
+                    # 如果高度没变，说明没有更多内容了，退出循环
                     break
+            except AssertionError:
+                # 如果加载动画没有出现，说明已经加载完所有内容，退出循环
+                break
+        
+        # 步骤3: 获取所有职位卡片
+        jobs = await container.locator(".job-card-box").all()
+        
+        # 步骤4: 遍历每个职位，提取信息
+        for job in jobs:
+            # 步骤4.1: 一次性读取职位卡片上的信息（公司、链接、地区、标签）
+            card = await job.evaluate(card_fields_js)
             
-            # 步骤5: 获取所有职位卡片
-            jobs = await container.locator(".job-card-box").all()
+            # 过滤标签检查：如果标签内容在过滤列表中，跳过这个职位
+            if filter_tags and card["tag"] in filter_tags:
+                continue  # 跳过这个职位
             
-            # 步骤6: 遍历每个职位，提取信息
-            for job in jobs:
-                # 步骤6.1: 过滤标签检查
-                # 如果指定了过滤标签
-                if filter_tags:
-                    tag = job.locator(".job-tag-icon")  # 职位标签图标
-                    # 如果标签可见且标签内容在过滤列表中，跳过这个职位
-                    if await tag.is_visible() and await tag.get_attribute("alt") in filter_tags:
-                        continue  # 跳过这个职位
-                
-                # 步骤6.2: 在点击之前先获取城市信息（更可靠）
-                company = job.locator(".boss-name")  # 公司名称元素
-                
-                # 先尝试从职位卡片获取城市（在点击之前）
-                job_city = default_city  # 使用搜索时的城市作为默认值
-                try:
-                    # 尝试多个选择器从职位卡片获取城市
-                    for selector in [".job-area", ".job-limit", ".job-info .job-area", ".job-info .job-limit"]:
-                        try:
-                            area_elem = job.locator(selector)
-                            if await area_elem.is_visible():
-                                city_text = await area_elem.inner_text()
-                                if city_text and city_text.strip():
-                                    # 提取城市名称（可能包含区域，只取城市名）
-                                    city_parts = city_text.strip().split()
-                                    if city_parts:
-                                        # 取第一个部分，通常是城市名
-                                        job_city = city_parts[0]
-                                        # 如果提取成功，跳出循环
-                                        if job_city != "未知":
-                                            break
-                        except:
-                            continue
-                except:
-                    pass
-                
-                # 点击前短暂停留：模拟用户思考（300-800毫秒）
-                await page.wait_for_timeout(random.randint(300, 800))
-                
-                # 点击职位卡片，打开详情页（随机延迟，模拟人类操作）
-                await job.click(delay=random.randint(32, 512))
-                
-                # 点击后等待：模拟页面切换时间（500-1000毫秒）
-                await page.wait_for_timeout(random.randint(500, 1000))
-                
-                # 步骤6.3: 等待详情页加载并提取信息
-                jd = page.locator(".job-detail-box")  # 职位详情框
-                title = jd.locator(".job-name")        # 职位名称
-                salary = jd.locator(".job-salary")     # 薪资
-                desc = jd.locator(".desc")             # 职位描述
-                boss = jd.locator(".job-boss-info")    # HR信息
-                
-                # 等待关键元素出现
-                await expect(desc).to_be_visible()
-                await expect(boss).to_be_visible()
-                
-                # 步骤6.4: 检查HR活跃时间
-                # 如果HR活跃时间过长（周/月/年），说明HR可能不活跃，跳过这个职位
-                active = boss.locator(".boss-active-time")
-                if await active.is_visible() and re.search(r"[周月年]", await active.inner_text()):
-                    continue  # 跳过这个职位
-                
-                # 步骤6.5: 提取公司名称
-                company_name = await company.inner_text()
-                
-                # 步骤6.6: 提取工作城市（如果之前没获取到，从详情页获取）
-                # 方法1: 如果之前从职位卡片获取失败，从职位详情页获取
-                if job_city == default_city or job_city == "未知":
-                    try:
-                        # 尝试多个可能的选择器从详情页获取
-                        for selector in [
-                            ".job-location", 
-                            ".job-area", 
-                            ".location", 
-                            ".job-info .location",
-                            ".info-primary .location",
-                            ".job-primary .location",
-                            ".job-header .location",
-                            ".job-detail-header .location"
-                        ]:
-                            try:
-                                city_elem = jd.locator(selector)
-                                if await city_elem.is_visible():
-                                    city_text = await city_elem.inner_text()
-                                    if city_text and city_text.strip():
-                                        city_parts = city_text.strip().split()
-                                        if city_parts:
-                                            job_city = city_parts[0]
-                                            # 如果提取成功且不是默认值，跳出循环
-                                            if job_city != default_city and job_city != "未知":
-                                                break
-                            except:
-                                continue
-                    except:
-                        pass
-                
-                # 方法2: 如果都获取不到，尝试从职位基本信息区域文本中提取
-                if job_city == default_city or job_city == "未知":
-                    try:
-                        # 从职位基本信息区域获取
-                        for info_selector in [".info-primary", ".job-primary", ".job-header", ".job-detail-header"]:
-                            try:
-                                info_elem = jd.locator(info_selector)
-                                if await info_elem.is_visible():
-                                    info_text = await info_elem.inner_text()
-                                    # 尝试从文本中提取城市（常见城市名称）
-                                    city_list = ["北京", "上海", "广州", "深圳", "杭州", "成都", "武汉", "西安", "南京", "苏州", 
-                                               "天津", "重庆", "长沙", "郑州", "济南", "青岛", "大连", "厦门", "福州", "合肥"]
-                                    for c in city_list:
-                                        if c in info_text:
-                                            job_city = c
-                                            break
-                                    if job_city != default_city and job_city != "未知":
-                                        break
-                            except:
-                                continue
-                    except:
-                        pass
-                
-                # 方法3: 如果还是获取不到，使用搜索时的城市作为默认值
-                if job_city == "未知":
-                    job_city = default_city
-                
-                # 步骤6.7: 获取职位链接并生成完整URL
-                job_url_relative = await job.locator(".job-name").get_attribute("href")
-                # 生成完整URL
-                if job_url_relative:
-                    if job_url_relative.startswith("http"):
-                        job_url_full = job_url_relative  # 如果已经是完整URL
-                    else:
-                        job_url_full = f"{base_url}{job_url_relative}"  # 拼接完整URL
+            # 生成职位完整URL
+            job_url_relative = card["href"]
+            if job_url_relative:
+                if job_url_relative.startswith("http"):
+                    job_url_full = job_url_relative  # 如果已经是完整URL
                 else:
-                    job_url_full = ""
-                
-                # 代码级关键词过滤（确保与搜索词相关）
-                title_text = await title.inner_text()
-                desc_text = await desc.inner_text()
-                if query:
-                    q = str(query).strip()
-                    if q:
-                        # 将搜索词按空格分割成多个关键词
-                        keywords = [kw.strip() for kw in q.split() if kw.strip()]
-                        
-                        # 检查是否所有关键词都在标题或描述中出现
-                        title_lower = title_text.lower()
-                        desc_lower = desc_text.lower()
-                        
-                        # 如果有多个关键词，要求所有关键词都出现在标题或描述中
-                        all_keywords_found = True
-                        for keyword in keywords:
-                            keyword_lower = keyword.lower()
-                            if (keyword_lower not in title_lower) and (keyword_lower not in desc_lower):
-                                all_keywords_found = False
-                                break
-                        
-                        # 如果不是所有关键词都找到，跳过这个职位
-                        if not all_keywords_found:
-                            continue
-
-                # 城市过滤：仅保留与搜索城市一致的职位
-                if job_city != default_city:
-                    continue
+                    job_url_full = f"{base_url}{job_url_relative}"  # 拼接完整URL
+            else:
+                job_url_full = ""
+            
+            # 已经获取过的职位，跳过（不用再点击和停留）
+            if job_url_full in self._seen_urls:
+                continue
+            
+            # 步骤4.2: 用职位卡片上的公司名称先做过滤（不符合的职位不用点击）
+            company_name = card["company"]
+            # 猎头过滤：排除猎头公司发布的职位
+            # 猎头公司名称通常包含"某"字，如"某大型互联网公司"、"某知名企业"等
+            if "某" in company_name:
+                continue
+            # 黑名单检查：如果指定了黑名单且公司在黑名单中，跳过这个职位
+            if blacklist and company_name in blacklist:
+                continue
+            
+            # 步骤4.3: 在点击之前先从职位卡片获取城市（更可靠）
+            # 地区可能包含区域，只取第一个部分，通常是城市名
+            area_parts = card["area"].split()
+            job_city = area_parts[0] if area_parts else default_city
+            # 城市过滤：卡片上的城市与搜索城市不一致，直接跳过
+            if job_city != default_city and job_city != "未知":
+                continue
+            
+            # 点击前短暂停留：模拟用户思考（300-800毫秒）
+            await self._dwell(300, 800)
+            
+            # 点击职位卡片，打开详情页（随机延迟，模拟人类操作）
+            await job.click(delay=random.randint(32, 512))
+            
+            # 点击后等待：模拟页面切换时间（500-1000毫秒）
+            await self._dwell(500, 1000)
+            
+            # 步骤4.4: 等待详情页加载，然后一次性读取详情页上的所有信息
+            jd = page.locator(".job-detail-box")  # 职位详情框
+            await expect(jd.locator(".desc")).to_be_visible()
+            await expect(jd.locator(".job-boss-info")).to_be_visible()
+            detail = await jd.evaluate(detail_fields_js)
+            
+            # 步骤4.5: 检查HR活跃时间
+            # 如果HR活跃时间过长（周/月/年），说明HR可能不活跃，跳过这个职位
+            if inactive_pattern.search(detail["active"]):
+                continue  # 跳过这个职位
+            
+            # 代码级关键词过滤（确保与搜索词相关）
+            title_text = detail["title"]
+            desc_text = detail["desc"]
+            if not matcher.match(title_text, desc_text):
+                continue
+            
+            # 步骤4.6: 提取工作城市（如果卡片上没获取到，从详情页获取）
+            # 方法1: 从职位详情页的工作地点获取
+            if job_city == default_city or job_city == "未知":
+                location_parts = detail["location"].split()
+                if location_parts:
+                    job_city = location_parts[0]
+            
+            # 方法2: 如果都获取不到，从职位基本信息区域文本中匹配城市名称
+            if job_city == default_city or job_city == "未知":
+                city_match = city_pattern.search(detail["info"])
+                if city_match:
+                    job_city = city_match.group(0)
+            
+            # 方法3: 如果还是获取不到，使用搜索时的城市作为默认值
+            if job_city == "未知":
+                job_city = default_city
+            
+            # 城市过滤：仅保留与搜索城市一致的职位
+            if job_city != default_city:
+                continue
 
-                # 猎头过滤：排除猎头公司发布的职位
-                # 猎头公司名称通常包含"某"字，如"某大型互联网公司"、"某知名企业"等
-                if "某" in company_name:
-                    continue
+            # 步骤4.7: 提取工作年限要求
+            # 先从职位基本信息区域提取，没找到再从职位描述中提取
+            experience_match = experience_pattern.search(detail["info"]) or experience_pattern.search(desc_text)
+            experience_text = experience_match.group(1) if experience_match else "不限"
 
-                # 步骤6.8: 提取工作年限要求
-                experience_text = "不限"  # 默认值
-                try:
-                    # 尝试从职位基本信息区域提取工作年限
-                    for info_selector in [".info-primary", ".job-primary", ".job-header", ".job-detail-header"]:
-                        try:
-                            info_elem = jd.locator(info_selector)
-                            if await info_elem.is_visible():
-                                info_text = await info_elem.inner_text()
-                                # 使用正则表达式匹配工作年限
-                                experience_match = re.search(r'(\d+[-~]\d+年|\d+年以上|不限|应届|实习)', info_text)
-                                if experience_match:
-                                    experience_text = experience_match.group(1)
-                                    break
-                        except:
-                            continue
-                    
-                    # 如果从基本信息区域没找到，尝试从职位描述中提取
-                    if experience_text == "不限":
-                        desc_lower = desc_text.lower()
-                        # 匹配常见的工作年限表达
-                        patterns = [
-                            r'(\d+[-~]\d+年工作经验)',
-                            r'(\d+年以上工作经验)',
-                            r'(应届毕业生)',
-                            r'(\d+[-~]\d+年经验)',
-                            r'(\d+年以上经验)',
-                        ]
-                        for pattern in patterns:
-                            match = re.search(pattern, desc_text)
-                            if match:
-                                experience_text = match.group(1)
-                                break
-                except:
-                    pass  # 如果提取失败，保持默认值
-
-                # 步骤6.9: 黑名单检查
-                # 如果指定了黑名单且公司在黑名单中，跳过这个职位
-                if not blacklist or company_name not in blacklist:
-                    # 详情页浏览停留：模拟用户阅读职位详情（2-5秒）
-                    await page.wait_for_timeout(random.randint(2000, 5000))
-                    
-                    # 随机鼠标移动：模拟用户浏览行为
-                    try:
-                        # 获取页面尺寸
-                        viewport = page.viewport_size
-                        if viewport:
-                            # 随机移动鼠标到页面中的某个位置
-                            random_x = random.randint(100, viewport["width"] - 100)
-                            random_y = random.randint(100, viewport["height"] - 100)
-                            await page.mouse.move(random_x, random_y)
-                            # 短暂停留（200-500毫秒）
-                            await page.wait_for_timeout(random.randint(200, 500))
-                    except:
-                        pass  # 如果鼠标移动失败，忽略错误
-                    
-                    # 步骤6.10: 创建职位对象并返回
-                    yield Job(Job.Info(
-                        company = company_name,  # 公司名称
-                        title = title_text,  # 职位名称
-                        salary = decode_salary(await salary.inner_text()),  # 薪资（需要解码）
-                        experience = experience_text,  # 工作年限要求
-                        desc = desc_text,  # 职位描述
-                        url = job_url_full,  # 职位链接（完整URL）
-                        city = job_city,  # 工作城市
-                    ))
+            # 步骤4.8: 所有过滤都通过后，才模拟用户阅读详情
+            # 详情页浏览停留：模拟用户阅读职位详情（2-5秒）
+            await self._dwell(2000, 5000)
+            
+            # 随机鼠标移动：模拟用户浏览行为（stealth_level为0时跳过）
+            try:
+                # 获取页面尺寸
+                viewport = page.viewport_size
+                if viewport and self._stealth_level:
+                    # 随机移动鼠标到页面中的某个位置
+                    random_x = random.randint(100, viewport["width"] - 100)
+                    random_y = random.randint(100, viewport["height"] - 100)
+                    await page.mouse.move(random_x, random_y)
+                    # 短暂停留（200-500毫秒）
+                    await self._dwell(200, 500)
+            except:
+                pass  # 如果鼠标移动失败，忽略错误
+            
+            # 步骤4.9: 创建职位对象并返回
+            yield Job(Job.Info(
+                company = company_name,  # 公司名称
+                title = title_text,  # 职位名称
+                salary = decode_salary(detail["salary"]),  # 薪资（需要解码）
+                experience = experience_text,  # 工作年限要求
+                desc = desc_text,  # 职位描述
+                url = job_url_full,  # 职位链接（完整URL）
+                city = job_city,  # 工作城市
+            ))
 
     async def query_jobs_from_config(self, config_path: str = "search_config.json") -> AsyncGenerator[Job, None]:
         """
         从配置文件读取参数并搜索职位
         
-        这个方法会自动读取配置文件，然后调用 query_jobs 方法进行搜索
+        这个方法会自动读取配置文件，然后为每个搜索任务调用 query_jobs 方法，
+        所有任务同时进行（共用同一个浏览器和登录状态），结果按获取到的先后顺序返回
+        
+        支持两种配置格式：
+        1. 批量配置：{"tasks": [...], "global_settings": {...}}（配置生成器生成的格式）
+        2. 单个搜索：{"search_params": {...}, "scroll_settings": {...}, "filter_settings": {...}}
         
         参数：
             config_path: 配置文件路径（默认"search_config.json"）
@@ -844,26 +1521,85 @@ class BossZhipin:
             职位对象的异步生成器
         
         示例：
-            async for job in boss.query_jobs_from_config("search_config.json"):
+            async for job in boss.query_jobs_from_config("batch_config.json"):
                 print(job.model_dump())
         """
+        # 如果没有用 async with 启动浏览器，临时启动一次（所有任务共用）
+        if self._context is None:
+            async with self:
+                async for job in self.query_jobs_from_config(config_path):
+                    yield job
+            return
+        
         # 加载配置文件
         config = self.load_config(config_path)
         
-        # 提取搜索参数
-        search_params = config.get("search_params", {})
-        scroll_settings = config.get("scroll_settings", {})
-        filter_settings = config.get("filter_settings", {})
-        
-        # 调用 query_jobs 方法进行搜索
-        async for job in self.query_jobs(
-            query=search_params.get("query", ""),
-            city=search_params.get("city", ""),
-            salary=search_params.get("salary"),
-            experience=search_params.get("experience"),
-            degree=search_params.get("degree"),
-            scroll_n=scroll_settings.get("scroll_n", 8),
-            filter_tags=set(filter_settings.get("filter_tags", [])) if filter_settings.get("filter_tags") else None,
-            blacklist=set(filter_settings.get("blacklist", [])) if filter_settings.get("blacklist") else None
-        ):
-            yield job
+        # 每个任务一个协程，结果都放进同一个队列
+        # 任务参数逐个生成，生成一个就启动一个，不需要先整理出全部任务
+        out_q: asyncio.Queue = asyncio.Queue()
+        # 限制同时进行的任务数量，其余任务等待前面的任务结束
+        task_semaphore = asyncio.Semaphore(config_task_workers)
+        
+        async def run_task(combo: dict) -> None:
+            async with task_semaphore:
+                # 使用不记录已获取职位的内部生成器，职位真正返回给调用方时才记录
+                await _pump(self._search_jobs(**combo, page=None), out_q)
+        
+        tasks = []
+        for combo in self._config_combos(config):
+            tasks.append(asyncio.create_task(run_task(combo)))
+        
+        try:
+            # 每个任务结束时都会放入一个None，全部结束后停止
+            async for job in _drain(out_q, len(tasks)):
+                # 不同任务搜到的同一个职位只返回一次
+                if job.url in self._seen_urls:
+                    continue
+                try:
+                    yield job
+                finally:
+                    # 调用方拿到职位之后才记录（队列中还没返回的职位不记录，下次仍会获取）
+                    self._mark_seen(job.url)
+        finally:
+            # 提前结束（或出错）时取消还在运行的任务，并等待它们结束（之后才能安全地关闭浏览器和会话）
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _config_combos(config: dict) -> Iterator[dict]:
+        """
+        从配置内容中逐个生成每个搜索任务的 query_jobs 参数
+        
+        参数：
+            config: 配置内容
+        
+        返回：
+            参数字典的迭代器（每个任务一个，用到时才生成）
+        """
+        if "tasks" in config:
+            # 批量配置：过滤设置和滚动次数在 global_settings 中，所有任务共用
+            settings = config.get("global_settings", {})
+            search_tasks = config["tasks"]
+        else:
+            # 单个搜索：只有一个任务
+            settings = {**config.get("scroll_settings", {}), **config.get("filter_settings", {})}
+            search_tasks = [config.get("search_params", {})]
+        
+        # 所有任务共用的设置，只读取一次
+        # 过滤标签和黑名单转换为不可变集合，所有任务共用同一个对象（为空时为None）
+        scroll_n = settings.get("scroll_n", 8)
+        filter_tags = frozenset(settings.get("filter_tags") or ()) or None
+        blacklist = frozenset(settings.get("blacklist") or ()) or None
+        
+        for task in search_tasks:
+            yield dict(
+                query=task.get("query", ""),
+                city=task.get("city", ""),
+                salary=task.get("salary"),
+                experience=task.get("experience"),
+                degree=task.get("degree"),
+                scroll_n=scroll_n,
+                filter_tags=filter_tags,
+                blacklist=blacklist,
+            )
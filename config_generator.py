@@ -7,113 +7,266 @@ Boss直聘配置生成器
 
 import json
 import os
-from typing import List, Dict, Any, Optional
+import sys
+import functools
+try:
+    # orjson是C语言实现的JSON库，直接生成UTF-8字节，比标准库json快
+    import orjson
+except ImportError:
+    # 没有安装orjson时使用标准库json
+    orjson = None
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Mapping, Tuple
+
+# 选项映射表（模块加载时创建一次，所有ConfigGenerator实例共用，只读）
+
+# 城市映射表
+_CITIES = MappingProxyType({
+    "全国": "100010000",
+    "北京": "101010100", 
+    "上海": "101020100",
+    "广州": "101280100",
+    "深圳": "101280600",
+    "杭州": "101210100",
+    "成都": "101270100",
+    "武汉": "101200100",
+    "西安": "101110100",
+    "南京": "101190100",
+    "苏州": "101190400",
+    "天津": "101030100",
+    "重庆": "101040100",
+    "长沙": "101250100",
+    "郑州": "101180100",
+    "济南": "101120100",
+    "青岛": "101120200",
+    "大连": "101070200",
+    "厦门": "101230200",
+    "福州": "101230100",
+    "合肥": "101220100"
+})
+
+# 薪资映射表
+_SALARIES = MappingProxyType({
+    "3k以下": "100",
+    "3-5k": "101",
+    "5-10k": "404",
+    "10-20k": "405",
+    "20-50k": "406",
+    "50k以上": "407"
+})
+
+# 经验映射表
+_EXPERIENCES = MappingProxyType({
+    "不限": None,
+    "1年内": "103",
+    "1-3年": "104", 
+    "3-5年": "105",
+    "5-10年": "106",
+    "10年以上": "109"
+})
+
+# 学历映射表
+_DEGREES = MappingProxyType({
+    "不限": None,
+    "大专": "202",
+    "本科": "203",
+    "硕士": "204"
+})
+
+# 公司规模映射表
+_SCALES = MappingProxyType({
+    "不限": None,
+    "0-20人": "301",
+    "20-99人": "302", 
+    "100-499人": "303",
+    "500-999人": "304",
+    "1000-9999人": "305",
+    "10000人以上": "306"
+})
+
+
+def _build_substr_index(mapping: Mapping[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """预先计算选项名称的所有子串到代码的映射（多个选项包含同一子串时，取靠前的选项）"""
+    index = {}
+    for key, code in mapping.items():
+        for i in range(len(key)):
+            for j in range(i + 1, len(key) + 1):
+                index.setdefault(key[i:j], code)
+    return index
+
+
+# 子串索引：输入是某个选项的一部分时（如"京"、"1-3"），一次查表即可找到代码
+_EXPERIENCES_SUBSTR_INDEX = _build_substr_index(_EXPERIENCES)
+_DEGREES_SUBSTR_INDEX = _build_substr_index(_DEGREES)
+_SCALES_SUBSTR_INDEX = _build_substr_index(_SCALES)
+
+# 城市反向索引：城市名称、名称的一部分、带"市"的全称（如"北京市"）都直接对应城市代码
+_CITY_LOOKUP: Dict[str, str] = _build_substr_index(_CITIES)
+for _city, _code in _CITIES.items():
+    if _city != "全国":
+        _CITY_LOOKUP.setdefault(_city + "市", _code)
+del _city, _code
+
+
+def _build_trie(mapping: Mapping[str, Optional[str]]) -> Dict[str, Any]:
+    """把选项名称建成字典树，结束节点的None键记录（选项顺序, 代码）"""
+    trie: Dict[str, Any] = {}
+    for order, (key, code) in enumerate(mapping.items()):
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[None] = (order, code)
+    return trie
+
+
+def _trie_search(trie: Dict[str, Any], text: str) -> Optional[str]:
+    """在文本中查找包含的选项名称，返回代码（包含多个时取靠前的选项，与逐个比较的结果一致）"""
+    best = None
+    for start in range(len(text)):
+        node = trie
+        for ch in text[start:]:
+            node = node.get(ch)
+            if node is None:
+                break
+            if None in node and (best is None or node[None][0] < best[0]):
+                best = node[None]
+    return best[1] if best else None
+
+
+def _option_rows(options: Mapping[str, Optional[str]], per_row: int) -> str:
+    """把选项名称排成每行per_row个的文本"""
+    names = list(options)
+    return "".join("  " + " | ".join(names[i:i + per_row]) + "\n" for i in range(0, len(names), per_row))
+
+
+# 可用选项说明（选项不会变化，模块加载时拼好一次，显示时一次写出）
+_OPTIONS_HELP = (
+    "\n=== 可用选项参考 ===\n"
+    "\n城市选项:\n" + _option_rows(_CITIES, 4) +
+    "\n薪资选项:\n" + _option_rows(_SALARIES, 4) +
+    "\n经验选项:\n" + _option_rows(_EXPERIENCES, len(_EXPERIENCES)) +
+    "\n学历选项:\n" + _option_rows(_DEGREES, len(_DEGREES)) +
+    "\n公司规模选项:\n" + _option_rows(_SCALES, len(_SCALES))
+)
+
+# 输出文件名中需要替换的字符（空格和斜杠替换为下划线），一次遍历完成替换
+_SAFE_NAME_TABLE = str.maketrans({" ": "_", "/": "_"})
+
+# 薪资字典树：只需要把输入扫描一遍，就能找到其中包含的薪资选项（如"月薪10-20k"）
+_SALARY_TRIE = _build_trie({key.lower(): code for key, code in _SALARIES.items()})
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_key(key: str) -> str:
+    """标准化输入的键值（统一为小写，如"10-20K"→"10-20k"；同一个输入只计算一次）"""
+    return key.lower()
+
+
+def _lookup(key: str, mapping: Mapping[str, Optional[str]], index: Mapping[str, Optional[str]]) -> Optional[str]:
+    """在映射表中查找代码：先查预先计算的索引（一次查表），没有命中再逐个做双向包含比较"""
+    code = index.get(key)
+    if code is not None:
+        return code
+    # 没有命中时，再逐个比较（例如输入包含选项名称："北京海淀"）
+    for name, code in mapping.items():
+        if key in name or name in key:
+            return code
+    return None
+
+
+def _salary_code(salary_str: str) -> Optional[str]:
+    """查找薪资代码"""
+    salary_normalized = _normalize_key(salary_str)
+    # 快速路径：输入正好是选项名称
+    code = _SALARIES.get(salary_normalized)
+    if code is not None:
+        return code
+    # 输入中包含薪资选项（用字典树查找，不需要逐个比较）
+    return _trie_search(_SALARY_TRIE, salary_normalized)
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_option_codes(salary: Optional[str],
+                          experience: Optional[str],
+                          degree: Optional[str],
+                          scale: Optional[str]) -> Tuple[Tuple[Optional[str], ...], Tuple[str, ...]]:
+    """查找薪资、经验、学历、公司规模的代码（只依赖输入和模块级映射表，同样的参数只查找一次）
+    
+    返回: ((薪资代码, 经验代码, 学历代码, 公司规模代码), 警告信息)
+    """
+    warnings = []
+    
+    # 查找薪资代码
+    salary_code = None
+    if salary:
+        salary_code = _salary_code(salary)
+        if not salary_code:
+            warnings.append(f"警告: 未找到薪资 '{salary}' 的代码，将设为不限")
+    
+    # 查找经验代码
+    experience_code = None
+    if experience:
+        experience_code = _lookup(experience, _EXPERIENCES, _EXPERIENCES_SUBSTR_INDEX)
+        if experience_code is None and experience != "不限":
+            warnings.append(f"警告: 未找到经验 '{experience}' 的代码，将设为不限")
+    
+    # 查找学历代码
+    degree_code = None
+    if degree:
+        degree_code = _lookup(degree, _DEGREES, _DEGREES_SUBSTR_INDEX)
+        if degree_code is None and degree != "不限":
+            warnings.append(f"警告: 未找到学历 '{degree}' 的代码，将设为不限")
+    
+    # 查找公司规模代码
+    scale_code = None
+    if scale:
+        scale_code = _lookup(scale, _SCALES, _SCALES_SUBSTR_INDEX)
+        if scale_code is None and scale != "不限":
+            warnings.append(f"警告: 未找到公司规模 '{scale}' 的代码，将设为不限")
+    
+    return (salary_code, experience_code, degree_code, scale_code), tuple(warnings)
+
 
 class ConfigGenerator:
+    # 实例只保存对模块级映射表的引用，用__slots__代替实例字典
+    __slots__ = ('cities', 'salaries', 'experiences', 'degrees', 'scales',
+                 '_experiences_substr_index', '_degrees_substr_index', '_scales_substr_index')
+
     def __init__(self):
-        # 城市映射表
-        self.cities = {
-            "全国": "100010000",
-            "北京": "101010100", 
-            "上海": "101020100",
-            "广州": "101280100",
-            "深圳": "101280600",
-            "杭州": "101210100",
-            "成都": "101270100",
-            "武汉": "101200100",
-            "西安": "101110100",
-            "南京": "101190100",
-            "苏州": "101190400",
-            "天津": "101030100",
-            "重庆": "101040100",
-            "长沙": "101250100",
-            "郑州": "101180100",
-            "济南": "101120100",
-            "青岛": "101120200",
-            "大连": "101070200",
-            "厦门": "101230200",
-            "福州": "101230100",
-            "合肥": "101220100"
-        }
-        
-        # 薪资映射表
-        self.salaries = {
-            "3k以下": "100",
-            "3-5k": "101",
-            "5-10k": "404",
-            "10-20k": "405",
-            "20-50k": "406",
-            "50k以上": "407"
-        }
-        
-        # 经验映射表
-        self.experiences = {
-            "不限": None,
-            "1年内": "103",
-            "1-3年": "104", 
-            "3-5年": "105",
-            "5-10年": "106",
-            "10年以上": "109"
-        }
-        
-        # 学历映射表
-        self.degrees = {
-            "不限": None,
-            "大专": "202",
-            "本科": "203",
-            "硕士": "204"
-        }
-        
-        # 公司规模映射表
-        self.scales = {
-            "不限": None,
-            "0-20人": "301",
-            "20-99人": "302", 
-            "100-499人": "303",
-            "500-999人": "304",
-            "1000-9999人": "305",
-            "10000人以上": "306"
-        }
+        # 映射表和子串索引都是模块级常量，这里只是绑定引用，不重新创建
+        self.cities = _CITIES
+        self.salaries = _SALARIES
+        self.experiences = _EXPERIENCES
+        self.degrees = _DEGREES
+        self.scales = _SCALES
+        self._experiences_substr_index = _EXPERIENCES_SUBSTR_INDEX
+        self._degrees_substr_index = _DEGREES_SUBSTR_INDEX
+        self._scales_substr_index = _SCALES_SUBSTR_INDEX
 
-    def normalize_key(self, key: str) -> str:
-        """标准化输入的键值"""
-        return key.lower().replace("k", "k").replace("K", "k")
+    @staticmethod
+    def normalize_key(key: str) -> str:
+        """标准化输入的键值（统一为小写，如"10-20K"→"10-20k"）"""
+        return _normalize_key(key)
 
     def find_city_code(self, city_name: str) -> Optional[str]:
-        """查找城市代码"""
-        for city, code in self.cities.items():
-            if city_name in city or city in city_name:
-                return code
-        return None
+        """查找城市代码（城市名称、名称的一部分、"北京市"这样的全称都可以）"""
+        return _lookup(city_name, self.cities, _CITY_LOOKUP)
 
     def find_salary_code(self, salary_str: str) -> Optional[str]:
         """查找薪资代码"""
-        salary_normalized = self.normalize_key(salary_str)
-        for salary, code in self.salaries.items():
-            if salary_normalized == salary or salary in salary_normalized:
-                return code
-        return None
+        return _salary_code(salary_str)
 
     def find_experience_code(self, exp_str: str) -> Optional[str]:
         """查找经验代码"""
-        for exp, code in self.experiences.items():
-            if exp_str in exp or exp in exp_str:
-                return code
-        return None
+        return _lookup(exp_str, self.experiences, self._experiences_substr_index)
 
     def find_degree_code(self, degree_str: str) -> Optional[str]:
         """查找学历代码"""
-        for degree, code in self.degrees.items():
-            if degree_str in degree or degree in degree_str:
-                return code
-        return None
+        return _lookup(degree_str, self.degrees, self._degrees_substr_index)
 
     def find_scale_code(self, scale_str: str) -> Optional[str]:
         """查找公司规模代码"""
-        for scale, code in self.scales.items():
-            if scale_str in scale or scale in scale_str:
-                return code
-        return None
+        return _lookup(scale_str, self.scales, self._scales_substr_index)
 
     def create_task(self, 
                    name: str,
@@ -123,82 +276,61 @@ class ConfigGenerator:
                    experience: str = None,
                    degree: str = None,
                    scale: str = None,
-                   output_file: str = None) -> Dict[str, Any]:
-        """创建单个搜索任务"""
+                   output_file: str = None,
+                   log: Optional[List[str]] = None) -> Dict[str, Any]:
+        """创建单个搜索任务（传入log列表时，警告信息加入列表而不是直接输出）"""
+        warn = log.append if log is not None else print
         
         # 查找城市代码
-        city_code = self.find_city_code(city)
+        city_code = _lookup(city, self.cities, _CITY_LOOKUP)
         if not city_code:
             raise ValueError(f"未找到城市 '{city}' 的代码")
         
-        # 查找薪资代码
-        salary_code = None
-        if salary:
-            salary_code = self.find_salary_code(salary)
-            if not salary_code:
-                print(f"警告: 未找到薪资 '{salary}' 的代码，将设为不限")
-        
-        # 查找经验代码
-        experience_code = None
-        if experience:
-            experience_code = self.find_experience_code(experience)
-            if experience_code is None and experience != "不限":
-                print(f"警告: 未找到经验 '{experience}' 的代码，将设为不限")
-        
-        # 查找学历代码
-        degree_code = None
-        if degree:
-            degree_code = self.find_degree_code(degree)
-            if degree_code is None and degree != "不限":
-                print(f"警告: 未找到学历 '{degree}' 的代码，将设为不限")
-        
-        # 查找公司规模代码
-        scale_code = None
-        if scale:
-            scale_code = self.find_scale_code(scale)
-            if scale_code is None and scale != "不限":
-                print(f"警告: 未找到公司规模 '{scale}' 的代码，将设为不限")
+        # 查找其他参数的代码（结果有缓存），每次都输出找不到代码的警告
+        (salary_code, experience_code, degree_code, scale_code), warnings = _resolve_option_codes(salary, experience, degree, scale)
+        for message in warnings:
+            warn(message)
         
         # 生成输出文件名
         if not output_file:
-            safe_name = name.replace(" ", "_").replace("/", "_")
+            safe_name = name.translate(_SAFE_NAME_TABLE)
             output_file = f"jobs_{safe_name}.json"
         
-        task = {
+        # 一次构建任务字典：必需字段 + 有值的可选字段（符合URL参数规则）
+        return {
             "name": name,
             "query": query,
             "city": city_code,
-            "output_file": output_file
+            "output_file": output_file,
+            **{key: code for key, code in (
+                ("salary", salary_code),
+                ("experience", experience_code),
+                ("degree", degree_code),
+                ("scale", scale_code),
+            ) if code},
         }
-        
-        # 只添加有值的可选字段（符合URL参数规则）
-        if salary_code:
-            task["salary"] = salary_code
-        if experience_code:
-            task["experience"] = experience_code
-        if degree_code:
-            task["degree"] = degree_code
-        if scale_code:
-            task["scale"] = scale_code
-            
-        return task
 
     def generate_config(self, 
                        tasks: List[Dict[str, str]],
                        scroll_n: int = 8,
                        output_format: str = "json",
                        merge_results: bool = False,
-                       merge_file: str = "all_jobs_merged.json") -> Dict[str, Any]:
-        """生成完整的配置文件"""
+                       merge_file: str = "all_jobs_merged.json",
+                       quiet: bool = False) -> Dict[str, Any]:
+        """生成完整的配置文件（quiet为True时不输出进度信息）"""
         
+        # 进度信息先收集起来，最后一次输出
+        log: List[str] = []
         config_tasks = []
         for task_info in tasks:
             try:
-                task = self.create_task(**task_info)
+                task = self.create_task(**task_info, log=log)
                 config_tasks.append(task)
-                print(f"✓ 已添加任务: {task['name']}")
+                log.append(f"✓ 已添加任务: {task['name']}")
             except Exception as e:
-                print(f"✗ 任务创建失败: {e}")
+                log.append(f"✗ 任务创建失败: {e}")
+        if log and not quiet:
+            sys.stdout.write("\n".join(log) + "\n")
         
         config = {
             "说明": "批量搜索配置文件 - 由配置生成器自动生成",
@@ -217,43 +349,41 @@ class ConfigGenerator:
 
     def save_config(self, config: Dict[str, Any], filename: str = "batch_config.json"):
         """保存配置文件"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        if orjson:
+            # 输出与 json.dump(indent=2, ensure_ascii=False) 完全相同
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
         print(f"✓ 配置文件已保存: {filename}")
 
     def show_available_options(self):
         """显示可用的选项"""
-        print("\n=== 可用选项参考 ===")
-        
-        print("\n城市选项:")
-        cities_list = list(self.cities.keys())
-        for i in range(0, len(cities_list), 4):
-            print("  " + " | ".join(cities_list[i:i+4]))
-        
-        print("\n薪资选项:")
-        salaries_list = list(self.salaries.keys())
-        for i in range(0, len(salaries_list), 4):
-            print("  " + " | ".join(salaries_list[i:i+4]))
-        
-        print("\n经验选项:")
-        print("  " + " | ".join(self.experiences.keys()))
-        
-        print("\n学历选项:")
-        print("  " + " | ".join(self.degrees.keys()))
-        
-        print("\n公司规模选项:")
-        print("  " + " | ".join(self.scales.keys()))
-
+        sys.stdout.write(_OPTIONS_HELP)
 
 def interactive_mode():
     """交互式配置生成"""
+    # 在函数内导入，避免与 quick_config 循环导入
+    from quick_config import parse_task_string
+    
     generator = ConfigGenerator()
     
+    # 输入来自管道或文件时，一次读入所有行，之后每个问题直接从内存中取一行
+    if sys.stdin.isatty():
+        ask = input
+    else:
+        lines = iter(sys.stdin.read().splitlines())
+        def ask(prompt: str) -> str:
+            # 和input()一样先输出提示；输入读完后返回空行（相当于直接回车，使用默认值）
+            sys.stdout.write(prompt)
+            return next(lines, "")
+    
     print("=== Boss直聘配置生成器 ===")
     print("支持简洁输入，自动生成配置文件\n")
     
     # 显示可用选项
-    show_options = input("是否显示可用选项? (y/n): ").lower().strip()
+    show_options = ask("是否显示可用选项? (y/n): ").lower().strip()
     if show_options == 'y':
         generator.show_available_options()
     
@@ -264,25 +394,36 @@ def interactive_mode():
     while True:
         print(f"\n--- 任务 {len(tasks) + 1} ---")
         
-        name = input("任务名称: ").strip()
+        name = ask("任务名称 (或一行输入 职位@城市,薪资,经验,学历,规模): ").strip()
         if not name:
             break
+        
+        # 一行输入了所有参数（与 quick_config 的格式相同），不再逐项询问
+        if '@' in name:
+            try:
+                task_info = parse_task_string(name)
+            except ValueError as e:
+                print(e)
+                continue
+            tasks.append(task_info)
+            print(f"✓ 任务 '{task_info['name']}' 已添加")
+            continue
             
-        query = input("搜索关键词: ").strip()
+        query = ask("搜索关键词: ").strip()
         if not query:
             print("搜索关键词不能为空")
             continue
             
-        city = input("城市 (如: 北京, 上海): ").strip()
+        city = ask("城市 (如: 北京, 上海): ").strip()
         if not city:
             print("城市不能为空")
             continue
         
-        salary = input("薪资范围 (如: 10-20k, 可选): ").strip() or None
-        experience = input("工作经验 (如: 3-5年, 可选): ").strip() or None
-        degree = input("学历要求 (如: 本科, 可选): ").strip() or None
-        scale = input("公司规模 (如: 100-499人, 可选): ").strip() or None
-        output_file = input("输出文件名 (可选, 自动生成): ").strip() or None
+        salary = ask("薪资范围 (如: 10-20k, 可选): ").strip() or None
+        experience = ask("工作经验 (如: 3-5年, 可选): ").strip() or None
+        degree = ask("学历要求 (如: 本科, 可选): ").strip() or None
+        scale = ask("公司规模 (如: 100-499人, 可选): ").strip() or None
+        output_file = ask("输出文件名 (可选, 自动生成): ").strip() or None
         
         task_info = {
             "name": name,
@@ -304,17 +445,17 @@ def interactive_mode():
     
     # 全局设置
     print("\n--- 全局设置 ---")
-    scroll_n = input("滚动次数 (默认8): ").strip()
+    scroll_n = ask("滚动次数 (默认8): ").strip()
     scroll_n = int(scroll_n) if scroll_n.isdigit() else 8
     
-    output_format = input("输出格式 (json/csv/txt, 默认json): ").strip().lower()
+    output_format = ask("输出格式 (json/csv/txt, 默认json): ").strip().lower()
     if output_format not in ['json', 'csv', 'txt']:
         output_format = 'json'
     
-    merge_results = input("是否合并所有结果? (y/n): ").lower().strip() == 'y'
+    merge_results = ask("是否合并所有结果? (y/n): ").lower().strip() == 'y'
     merge_file = "all_jobs_merged.json"
     if merge_results:
-        merge_file = input("合并文件名 (默认all_jobs_merged.json): ").strip() or merge_file
+        merge_file = ask("合并文件名 (默认all_jobs_merged.json): ").strip() or merge_file
     
     # 生成配置
     print("\n--- 生成配置 ---")
@@ -327,7 +468,7 @@ def interactive_mode():
     )
     
     # 保存配置
-    filename = input("配置文件名 (默认batch_config.json): ").strip() or "batch_config.json"
+    filename = ask("配置文件名 (默认batch_config.json): ").strip() or "batch_config.json"
     generator.save_config(config, filename)
     
     print(f"\n✓ 配置生成完成! 共 {len(config['tasks'])} 个任务")
@@ -21,34 +21,27 @@ def parse_task_string(task_str: str) -> dict:
     格式: "职位@城市,薪资,经验,学历,规模"
     示例: "Python开发@北京,10-20k,3-5年,本科,1000-9999人"
     """
-    if '@' not in task_str:
+    # 分离职位和其他参数（partition 只切分第一个@）
+    query, sep, params_part = task_str.partition('@')
+    if not sep:
         raise ValueError(f"任务格式错误: {task_str}，应为 '职位@城市,薪资,经验,学历,规模'")
+    query = query.strip()
     
-    # 分离职位和其他参数
-    query_part, params_part = task_str.split('@', 1)
-    query = query_part.strip()
-    
-    # 分离城市和其他参数
-    params = params_part.split(',')
-    city = params[0].strip()
-    
-    # 解析可选参数
-    salary = params[1].strip() if len(params) > 1 and params[1].strip() else None
-    experience = params[2].strip() if len(params) > 2 and params[2].strip() else None
-    degree = params[3].strip() if len(params) > 3 and params[3].strip() else None
-    scale = params[4].strip() if len(params) > 4 and params[4].strip() else None
+    # 分离城市和可选参数（不足5项时补空字符串，多余的参数忽略）
+    city, salary, experience, degree, scale, *_ = [p.strip() for p in params_part.split(',')] + [''] * 4
     
     # 生成任务名称
     name = f"{city}{query}"
     
+    # 可选参数为空时设为None
     return {
         "name": name,
         "query": query,
         "city": city,
-        "salary": salary,
-        "experience": experience,
-        "degree": degree,
-        "scale": scale
+        "salary": salary or None,
+        "experience": experience or None,
+        "degree": degree or None,
+        "scale": scale or None
     }
 
 def main():
@@ -71,15 +64,17 @@ def main():
     generator = ConfigGenerator()
     tasks = []
     
-    # 解析所有任务
+    # 解析所有任务（解析结果先收集起来，最后一次输出）
+    log = []
     for i, task_str in enumerate(sys.argv[1:], 1):
         try:
             task_info = parse_task_string(task_str)
             tasks.append(task_info)
-            print(f"✓ 任务 {i}: {task_info['name']}")
+            log.append(f"✓ 任务 {i}: {task_info['name']}")
         except Exception as e:
-            print(f"✗ 任务 {i} 解析失败: {e}")
-            print(f"  输入: {task_str}")
+            log.append(f"✗ 任务 {i} 解析失败: {e}")
+            log.append(f"  输入: {task_str}")
+    sys.stdout.write("\n".join(log) + "\n")
     
     if not tasks:
         print("没有有效的任务，退出")
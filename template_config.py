@@ -5,78 +5,102 @@ Boss直聘配置模板生成器
 提供常用的搜索模板，快速生成配置
 """
 
+from itertools import product
 from config_generator import ConfigGenerator
 
+# 预定义模板（模块加载时创建一次，所有TemplateGenerator实例共用；生成配置时会复制任务模板，不会修改这里的内容）
+_TEMPLATES = {
+    "python_dev": {
+        "name": "Python开发工程师搜索",
+        "description": "搜索Python开发相关职位",
+        "tasks": [
+            {"query": "Python开发", "salary": "15-20k", "experience": "3-5年", "degree": "本科"},
+            {"query": "Python后端", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
+            {"query": "Django开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
+            {"query": "Flask开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"}
+        ]
+    },
+
+    "frontend_dev": {
+        "name": "前端开发工程师搜索",
+        "description": "搜索前端开发相关职位",
+        "tasks": [
+            {"query": "前端开发", "salary": "15-20k", "experience": "3-5年", "degree": "本科"},
+            {"query": "Vue开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
+            {"query": "React开发", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
+            {"query": "JavaScript开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"}
+        ]
+    },
+
+    "product_manager": {
+        "name": "产品经理搜索",
+        "description": "搜索产品经理相关职位",
+        "tasks": [
+            {"query": "产品经理", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
+            {"query": "产品运营", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
+            {"query": "产品专员", "salary": "10-15k", "experience": "1-3年", "degree": "本科"},
+            {"query": "AI产品经理", "salary": "30-50k", "experience": "3-5年", "degree": "本科"}
+        ]
+    },
+
+    "data_analyst": {
+        "name": "数据分析师搜索",
+        "description": "搜索数据分析相关职位",
+        "tasks": [
+            {"query": "数据分析师", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
+            {"query": "数据科学家", "salary": "30-50k", "experience": "3-5年", "degree": "硕士"},
+            {"query": "算法工程师", "salary": "30-50k", "experience": "3-5年", "degree": "硕士"},
+            {"query": "机器学习", "salary": "30-50k", "experience": "3-5年", "degree": "硕士"}
+        ]
+    },
+
+    "ui_designer": {
+        "name": "UI设计师搜索",
+        "description": "搜索UI/UX设计相关职位",
+        "tasks": [
+            {"query": "UI设计师", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
+            {"query": "UX设计师", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
+            {"query": "交互设计师", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
+            {"query": "视觉设计师", "salary": "15-20k", "experience": "1-3年", "degree": "本科"}
+        ]
+    },
+
+    "multi_city": {
+        "name": "多城市搜索模板",
+        "description": "在多个城市搜索同一职位",
+        "cities": ["北京", "上海", "深圳", "杭州", "成都"],
+        "tasks": [
+            {"query": "Python开发", "salary": "20-30k", "experience": "3-5年", "degree": "本科"}
+        ]
+    }
+}
+
+
+def _expand_tasks(cities: list, task_templates: list) -> list:
+    """每个城市 × 每个任务模板 生成一个任务（复制任务模板，加上城市和任务名称）"""
+    return [
+        {**task_template, 'city': city, 'name': city + task_template['query']}
+        for city, task_template in product(cities, task_templates)
+    ]
+
+
+# 使用默认城市时展开好的任务列表（模块加载时计算一次）
+# 多城市模板默认使用模板中的城市，普通模板默认北京
+_EXPANDED_TEMPLATES = {
+    key: _expand_tasks(template['cities'] if key == "multi_city" else ["北京"], template['tasks'])
+    for key, template in _TEMPLATES.items()
+}
+
+# 共用的配置生成器（ConfigGenerator没有可变状态，不需要每次重新创建）
+_SHARED_GENERATOR = ConfigGenerator()
+
+
 class TemplateGenerator:
+    __slots__ = ('generator', 'templates')
+
     def __init__(self):
-        self.generator = ConfigGenerator()
-        
-        # 预定义模板
-        self.templates = {
-            "python_dev": {
-                "name": "Python开发工程师搜索",
-                "description": "搜索Python开发相关职位",
-                "tasks": [
-                    {"query": "Python开发", "salary": "15-20k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "Python后端", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "Django开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
-                    {"query": "Flask开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"}
-                ]
-            },
-            
-            "frontend_dev": {
-                "name": "前端开发工程师搜索",
-                "description": "搜索前端开发相关职位",
-                "tasks": [
-                    {"query": "前端开发", "salary": "15-20k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "Vue开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
-                    {"query": "React开发", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "JavaScript开发", "salary": "15-20k", "experience": "1-3年", "degree": "本科"}
-                ]
-            },
-            
-            "product_manager": {
-                "name": "产品经理搜索",
-                "description": "搜索产品经理相关职位",
-                "tasks": [
-                    {"query": "产品经理", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "产品运营", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
-                    {"query": "产品专员", "salary": "10-15k", "experience": "1-3年", "degree": "本科"},
-                    {"query": "AI产品经理", "salary": "30-50k", "experience": "3-5年", "degree": "本科"}
-                ]
-            },
-            
-            "data_analyst": {
-                "name": "数据分析师搜索",
-                "description": "搜索数据分析相关职位",
-                "tasks": [
-                    {"query": "数据分析师", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
-                    {"query": "数据科学家", "salary": "30-50k", "experience": "3-5年", "degree": "硕士"},
-                    {"query": "算法工程师", "salary": "30-50k", "experience": "3-5年", "degree": "硕士"},
-                    {"query": "机器学习", "salary": "30-50k", "experience": "3-5年", "degree": "硕士"}
-                ]
-            },
-            
-            "ui_designer": {
-                "name": "UI设计师搜索",
-                "description": "搜索UI/UX设计相关职位",
-                "tasks": [
-                    {"query": "UI设计师", "salary": "15-20k", "experience": "1-3年", "degree": "本科"},
-                    {"query": "UX设计师", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "交互设计师", "salary": "20-30k", "experience": "3-5年", "degree": "本科"},
-                    {"query": "视觉设计师", "salary": "15-20k", "experience": "1-3年", "degree": "本科"}
-                ]
-            },
-            
-            "multi_city": {
-                "name": "多城市搜索模板",
-                "description": "在多个城市搜索同一职位",
-                "cities": ["北京", "上海", "深圳", "杭州", "成都"],
-                "tasks": [
-                    {"query": "Python开发", "salary": "20-30k", "experience": "3-5年", "degree": "本科"}
-                ]
-            }
-        }
+        self.generator = _SHARED_GENERATOR
+        self.templates = _TEMPLATES
 
     def show_templates(self):
         """显示所有可用模板"""
@@ -95,27 +119,12 @@ class TemplateGenerator:
         if template_key not in self.templates:
             raise ValueError(f"模板 '{template_key}' 不存在")
         
-        template = self.templates[template_key]
-        tasks = []
-        
-        # 处理多城市模板
-        if template_key == "multi_city":
-            cities = cities or template['cities']
-            for city in cities:
-                for task_template in template['tasks']:
-                    task_info = task_template.copy()
-                    task_info['city'] = city
-                    task_info['name'] = f"{city}{task_info['query']}"
-                    tasks.append(task_info)
+        # 指定了城市时按指定的城市展开，否则直接使用预先展开好的任务
+        # （生成配置时不会修改任务字典，可以直接共用）
+        if cities:
+            tasks = _expand_tasks(cities, self.templates[template_key]['tasks'])
         else:
-            # 处理普通模板
-            cities = cities or ["北京"]  # 默认城市
-            for city in cities:
-                for task_template in template['tasks']:
-                    task_info = task_template.copy()
-                    task_info['city'] = city
-                    task_info['name'] = f"{city}{task_info['query']}"
-                    tasks.append(task_info)
+            tasks = _EXPANDED_TEMPLATES[template_key]
         
         # 应用自定义设置
         settings = {